@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+from utils.cache_manager import feed_cache, recipe_cache
+from utils.connection_registry import connection_registry
+from utils.db_manager import db_manager
+from utils.response_manager import common_responses
+from utils.session_manager import get_current_session, session_manager
+
+router = APIRouter()
+
+
+def check_admin(current_user: str = Depends(get_current_session)):
+    if current_user != "admin":
+        raise HTTPException(status_code=403, detail="권한이 없습니다.")
+    return current_user
+
+
+@router.get("/cache-stats", dependencies=[Depends(check_admin)], responses=common_responses)
+async def get_cache_stats():
+    return {
+        "recipe_cache": recipe_cache.stats(),
+        "feed_cache": feed_cache.stats(),
+        "session_cache": session_manager.stats(),
+    }
+
+
+@router.get("/db-pool-stats", dependencies=[Depends(check_admin)], responses=common_responses)
+async def get_db_pool_stats():
+    return db_manager.pool_stats()
+
+
+@router.get("/websocket-stats", dependencies=[Depends(check_admin)], responses=common_responses)
+async def get_websocket_stats():
+    return connection_registry.stats()
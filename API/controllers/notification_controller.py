@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from models.response_models import MarkReadRequest, MarkReadResponse, NotificationList
+from utils.notification_manager import NotificationManager, get_notification_manager, validate_stream_id
+from utils.response_manager import common_responses
+from utils.session_manager import get_current_session
+
+router = APIRouter()
+
+
+@router.get("/", response_model=NotificationList, responses=common_responses)
+async def get_notifications(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: str = Depends(get_current_session),
+    notification_manager: NotificationManager = Depends(get_notification_manager),
+):
+    # cursor 가 없으면 마지막으로 읽은 알림 이후부터 오래된 순으로 반환
+    notifications = await notification_manager.get_notifications(
+        current_user, after=validate_stream_id(cursor), limit=limit
+    )
+    return {
+        "notifications": notifications,
+        "unread_count": await notification_manager.count_unread(current_user),
+        "next_cursor": notifications[-1]["id"] if len(notifications) == limit else None,
+    }
+
+
+@router.post("/read", response_model=MarkReadResponse, responses=common_responses)
+async def mark_notifications_read(
+    request: MarkReadRequest,
+    current_user: str = Depends(get_current_session),
+    notification_manager: NotificationManager = Depends(get_notification_manager),
+):
+    # up_to 까지의 알림을 한 번에 읽음 처리 (생략하면 전부)
+    last_read_id = await notification_manager.mark_read(current_user, validate_stream_id(request.up_to))
+    return {"last_read_id": last_read_id}
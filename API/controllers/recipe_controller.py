@@ -1,37 +1,50 @@
-from fastapi import Depends, HTTPException, Path, Query, Response
-from bson import json_util
+from fastapi import BackgroundTasks, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from utils.config import get_settings
-from utils.db_manager import MongoDBManager
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from typing import List
+from utils.response_manager import MongoJSONResponse
+from typing import List, Optional
+import asyncio
 import json
 from models.recipe_models import CommentBase, CommentIn, CommentUpdate, RecipeBase, RecipeCreate, RecipeGetList, RecipeIn, RecipeUpdate
 from dao.recipe_dao import RecipeDao
 
 from services.recipe_service import RecipeService
+from services.recipe_import_service import RecipeImportService, iter_file_chunks, spool_body
 from utils.session_manager import SessionManager, get_current_session, get_current_user
+from utils.pagination_manager import decode_cursor, next_cursor
 
-router = APIRouter()
+router = APIRouter(default_response_class=MongoJSONResponse)
 recipe_dao = RecipeDao()
 recipe_service = RecipeService(recipe_dao)
+recipe_import_service = RecipeImportService(recipe_dao)
 settings = get_settings()
-db_manager = MongoDBManager()
-collection = db_manager.get_collection("recipes")
+
+
+def recipe_page_response(recipes, limit: int):
+    # cursor 파라미터로 요청한 경우 다음 페이지 커서를 함께 반환
+    return MongoJSONResponse(content={
+        "recipes": recipes,
+        "next_cursor": next_cursor(recipes, limit, "recipe_id")
+    })
 
 
 @router.get("/", response_model=RecipeGetList, tags=["recipes_get"])
 async def get_all_recipes(    
     page: int = 1,
-    limit: int = 160
+    limit: int = 160,
+    cursor: Optional[str] = None,
+    full: bool = False
 ):
+    after = decode_cursor(cursor)
     try:
         skip_count = (page - 1) * limit
-        recipes = await recipe_service.get_all_recipes(skip=skip_count, limit=limit)
-        serialized_recipes = json.loads(json.dumps(recipes, default=str))
+        recipes = await recipe_service.get_all_recipes(skip=skip_count, limit=limit, after=after, full=full)
+        if cursor is not None:
+            return recipe_page_response(recipes, limit)
         if len(recipes) == 0:
-            return JSONResponse(content=[])
-        return JSONResponse(content=serialized_recipes)
+            return MongoJSONResponse(content=[])
+        return MongoJSONResponse(content=recipes)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -40,57 +53,47 @@ async def get_all_recipes(
 async def get_recipes_by_categories(
     value: str = Query(...),
     page: int = 1,
-    limit: int = 160
+    limit: int = 160,
+    cursor: Optional[str] = None,
+    full: bool = False
 ):
+    after = decode_cursor(cursor)
     try:
         skip_count = (page - 1) * limit
-        recipes = await recipe_service.get_recipes_by_categories(value, skip=skip_count, limit=limit)
-        serialized_recipes = json.loads(json.dumps(recipes, default=str))
+        recipes = await recipe_service.get_recipes_by_categories(value, skip=skip_count, limit=limit, after=after, full=full)
+        if cursor is not None:
+            return recipe_page_response(recipes, limit)
         if len(recipes) == 0:
-            return JSONResponse(content=[])
-        return JSONResponse(content=serialized_recipes)
+            return MongoJSONResponse(content=[])
+        return MongoJSONResponse(content=recipes)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/search", response_model=RecipeGetList, tags=["recipes_get"])
-async def search_recipes_by_title(value: str, page: int = 1, limit: int = 160):
-    pipeline = [
-        {"$match": {
-            "$or": [
-                {"recipe_title": {"$regex": value, "$options": "i"}},
-                {"recipe_category": {"$regex": value, "$options": "i"}},
-                {"recipe_description": {"$regex": value, "$options": "i"}},
-                {"recipe_info": {"$regex": value, "$options": "i"}},
-                {"recipe_ingredients.name": {"$regex": value, "$options": "i"}}
-            ]
-        }},
-        {"$skip": (page - 1) * limit},
-        {"$limit": limit}
-    ]
-    result_cursor = collection.aggregate(pipeline)
-    result = []
-    async for document in result_cursor:
-        result.append(json_util.loads(json_util.dumps(document)))
+async def search_recipes_by_title(value: str, page: int = 1, limit: int = 160, full: bool = False):
+    skip_count = (page - 1) * limit
+    result = await recipe_service.search_recipes(value, skip=skip_count, limit=limit, full=full)
     if len(result) == 0:
-        return JSONResponse(content=[])
-    if not result:
-        raise HTTPException(status_code=404, detail="No recipes found")
-    serialized_recipes = json.loads(json.dumps(result, default=str))
-    return JSONResponse(content=serialized_recipes)
+        return MongoJSONResponse(content=[])
+    return MongoJSONResponse(content=result)
 
 
 @router.get("/user", dependencies=[Depends(get_current_session)], response_model=RecipeGetList, tags=["recipes_get"])
 async def get_recipes_by_user_id(
     current_user: str = Depends(get_current_session), 
     page: int = 1,
-    limit: int = 150):
+    limit: int = 150,
+    cursor: Optional[str] = None,
+    full: bool = False):
+    after = decode_cursor(cursor)
     skip_count = (page - 1) * limit
-    recipes = await recipe_service.get_recipes_by_user_id(current_user,skip=skip_count, limit=limit)
+    recipes = await recipe_service.get_recipes_by_user_id(current_user,skip=skip_count, limit=limit, after=after, full=full)
+    if cursor is not None:
+        return recipe_page_response(recipes, limit)
     if len(recipes) == 0:
-        return JSONResponse(content=[])
+        return MongoJSONResponse(content=[])
     if recipes:
-        serialized_recipes = json.loads(json.dumps(recipes, default=str))
         return RecipeGetList(recipes=recipes)
     else:
         raise HTTPException(status_code=404, detail="User not found")
@@ -99,14 +102,14 @@ async def get_recipes_by_user_id(
 @router.get("/popularity", response_model=RecipeGetList, tags=["recipes_get"])
 async def get_recipes_by_popularity(    
     page: int = 1,
-    limit: int = 160):
+    limit: int = 160,
+    full: bool = False):
     try:
         skip_count = (page - 1) * limit
-        recipes = await recipe_service.get_recipes_by_popularity(skip=skip_count, limit=limit)
-        serialized_recipes = json.loads(json.dumps(recipes, default=str))
+        recipes = await recipe_service.get_recipes_by_popularity(skip=skip_count, limit=limit, full=full)
         if len(recipes) == 0:
-            return JSONResponse(content=[])
-        return JSONResponse(content=serialized_recipes)
+            return MongoJSONResponse(content=[])
+        return MongoJSONResponse(content=recipes)
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=str(e))
@@ -114,15 +117,19 @@ async def get_recipes_by_popularity(
 @router.get("/latest", response_model=RecipeGetList, tags=["recipes_get"])
 async def get_recipes_by_latest(
     page: int = 1,
-    limit: int = 160
+    limit: int = 160,
+    cursor: Optional[str] = None,
+    full: bool = False
 ):
+    after = decode_cursor(cursor)
     try:
         skip_count = (page - 1) * limit
-        recipes = await recipe_service.get_recipes_by_latest(skip=skip_count, limit=limit)
-        serialized_recipes = json.loads(json.dumps(recipes, default=str))
+        recipes = await recipe_service.get_recipes_by_latest(skip=skip_count, limit=limit, after=after, full=full)
+        if cursor is not None:
+            return recipe_page_response(recipes, limit)
         if len(recipes) == 0:
-            return JSONResponse(content=[])
-        return JSONResponse(content=serialized_recipes)
+            return MongoJSONResponse(content=[])
+        return MongoJSONResponse(content=recipes)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -130,15 +137,19 @@ async def get_recipes_by_latest(
 @router.get("/single", response_model=RecipeGetList, tags=["recipes_get"])
 async def get_recipes_by_single_serving(    
     page: int = 1,
-    limit: int = 160
+    limit: int = 160,
+    cursor: Optional[str] = None,
+    full: bool = False
     ):
+    after = decode_cursor(cursor)
     try:
         skip_count = (page - 1) * limit
-        recipes = await recipe_service.get_recipes_by_single_serving(skip=skip_count, limit=limit)
-        serialized_recipes = json.loads(json.dumps(recipes, default=str))
+        recipes = await recipe_service.get_recipes_by_single_serving(skip=skip_count, limit=limit, after=after, full=full)
+        if cursor is not None:
+            return recipe_page_response(recipes, limit)
         if len(recipes) == 0:
-            return JSONResponse(content=[])
-        return JSONResponse(content=serialized_recipes)
+            return MongoJSONResponse(content=[])
+        return MongoJSONResponse(content=recipes)
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=str(e))
@@ -147,46 +158,104 @@ async def get_recipes_by_single_serving(
 @router.get("/vegetarian", response_model=RecipeGetList, tags=["recipes_get"])
 async def get_recipes_by_vegetarian(
     page: int = 1,
-    limit: int = 160
+    limit: int = 160,
+    cursor: Optional[str] = None,
+    full: bool = False
     ):
+    after = decode_cursor(cursor)
     try:
         skip_count = (page - 1) * limit
-        recipes = await recipe_service.get_recipes_by_vegetarian(skip=skip_count, limit=limit)
-        serialized_recipes = json.loads(json.dumps(recipes, default=str))
+        recipes = await recipe_service.get_recipes_by_vegetarian(skip=skip_count, limit=limit, after=after, full=full)
+        if cursor is not None:
+            return recipe_page_response(recipes, limit)
         if len(recipes) == 0:
-            return JSONResponse(content=[])
-        return JSONResponse(content=serialized_recipes)
+            return MongoJSONResponse(content=[])
+        return MongoJSONResponse(content=recipes)
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=str(e))
 
 
+def split_ingredients(values: List[str]) -> List[str]:
+    # value=두부&value=김치 와 value=두부,김치 형식을 모두 허용
+    return [name.strip() for value in values for name in value.split(",") if name.strip()]
+
+
 @router.get("/ingredients", response_model=RecipeGetList, tags=["recipes_get"])
-async def get_recipes_by_ingredients(value: str):
+async def get_recipes_by_ingredients(
+    value: List[str] = Query(...),
+    match: str = Query("any", regex="^(any|all)$"),
+    exclude: List[str] = Query([]),
+    page: int = 1,
+    limit: int = 160,
+    full: bool = False
+):
+    ingredients = split_ingredients(value)
+    if not ingredients:
+        raise HTTPException(status_code=400, detail="재료를 하나 이상 입력해주세요.")
     try:
-        recipes = await recipe_service.get_recipes_by_ingredients(value)
-        serialized_recipes = json.loads(json.dumps(recipes, default=str))
+        skip_count = (page - 1) * limit
+        recipes = await recipe_service.get_recipes_by_ingredients(
+            ingredients,
+            match_all=match == "all",
+            exclude=split_ingredients(exclude),
+            skip=skip_count,
+            limit=limit,
+            full=full
+        )
         if len(recipes) == 0:
-            return JSONResponse(content=[])
-        return JSONResponse(content=serialized_recipes)
+            return MongoJSONResponse(content=[])
+        return MongoJSONResponse(content=recipes)
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=str(e))
 
 
+@router.get("/liked", dependencies=[Depends(get_current_session)], tags=["recipes_get"])
+async def get_liked_recipes(
+    recipe_ids: List[str] = Query(...),
+    current_user: str = Depends(get_current_session)
+):
+    # 피드 한 페이지의 레시피 중 현재 사용자가 좋아요를 누른 레시피를 한 번에 조회
+    if len(recipe_ids) > 500:
+        raise HTTPException(status_code=400, detail="recipe_ids 는 500개 이하로 요청해주세요.")
+    liked = await recipe_service.get_liked_recipe_ids(recipe_ids, current_user)
+    return {"liked": liked}
+
+
 @router.get("/{recipe_id}", tags=["recipes_get"])
-async def get_recipe_by_recipe_id(recipe_id: str):
-    recipe = await recipe_service.get_recipe_by_recipe_id(recipe_id)
+async def get_recipe_by_recipe_id(recipe_id: str, background_tasks: BackgroundTasks):
+    # 레시피와 댓글은 서로 독립적이므로 동시에 조회
+    recipe, comments = await asyncio.gather(
+        recipe_service.get_recipe_by_recipe_id(recipe_id),
+        recipe_service.get_comments(recipe_id)
+    )
     if recipe is None:
         raise HTTPException(
             status_code=404,
             detail=f"Recipe with id {recipe_id} not found"
         )
-    comments = await recipe_service.get_comments(recipe_id)
+    # 댓글은 첫 페이지만 포함하고, 나머지는 next_comment_cursor 로 /{recipe_id}/comments 에서 조회
     recipe['comments'] = comments
-    await recipe_service.update_recipe_view(recipe_id)
-    serialized_recipes = json.loads(json.dumps(recipe, default=str))
-    return JSONResponse(content={"recipe": serialized_recipes})
+    recipe['comment_count'] = recipe.get('comment_count', len(comments))
+    recipe['next_comment_cursor'] = next_cursor(comments, settings.detail_comment_limit, "comment_id")
+    # 조회수 증가는 응답 전송 후 처리
+    background_tasks.add_task(recipe_service.update_recipe_view, recipe_id)
+    return MongoJSONResponse(content={"recipe": recipe})
+
+
+@router.get("/{recipe_id}/comments", tags=["comment"])
+async def get_recipe_comments(
+    recipe_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    after = decode_cursor(cursor)
+    comments = await recipe_service.get_comments_page(recipe_id, after=after, limit=limit)
+    return MongoJSONResponse(content={
+        "comments": comments,
+        "next_cursor": next_cursor(comments, limit, "comment_id")
+    })
 
 
 @router.post("/", dependencies=[Depends(get_current_session)], status_code=201, tags=["recipes"])
@@ -198,13 +267,28 @@ async def register_recipe(recipe: dict, current_user: str = Depends(get_current_
         if result is None:
             raise HTTPException(
                 status_code=500, detail="Failed to insert recipe")
-        serialized_recipes = json.loads(json.dumps(result, default=str))
-        return JSONResponse(content=serialized_recipes)
+        return MongoJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=str(e))
 
 
+@router.post("/import", dependencies=[Depends(get_current_session)], tags=["recipes"])
+async def import_recipes(request: Request, batch_size: Optional[int] = Query(None, ge=1, le=10000),
+                         current_user: str = Depends(get_current_session)):
+    # NDJSON(한 줄에 레시피 하나) 본문을 배치 단위로 저장하고 진행 상황을 NDJSON 으로 스트리밍 반환
+    if current_user != "admin":
+        raise HTTPException(status_code=403, detail="권한이 없습니다.")
+
+    body = await spool_body(request.stream())
+
+    async def progress():
+        async for item in recipe_import_service.import_recipes(iter_file_chunks(body), batch_size):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
+
 @router.delete("/{recipe_id}", status_code=204, dependencies=[Depends(get_current_session)], tags=["recipes"])
 async def delete_recipe(recipe_id: str, current_user: str = Depends(get_current_session)):
     try:
@@ -226,9 +310,7 @@ async def update_recipe(recipe_id: str, updated_recipe: RecipeUpdate, current_us
                 detail=f"Recipe with id {recipe_id} not found"
             )
         updated_document = await recipe_service.update_recipe(recipe_id, updated_recipe, current_user)
-        serialized_recipe = json.loads(
-            json.dumps(updated_document, default=str))
-        return JSONResponse(content=serialized_recipe, status_code=201)
+        return MongoJSONResponse(content=updated_document, status_code=201)
     except HTTPException as e:
         raise HTTPException(
             status_code=e.status_code,
@@ -245,8 +327,7 @@ async def update_like(recipe_id: str, current_user: str = Depends(get_current_se
                 status_code=404,
                 detail=f"Recipe with id {recipe_id} not found"
             )
-        serialized_recipe = json.loads(json.dumps(recipe, default=str))
-        return JSONResponse(content=serialized_recipe, status_code=201)
+        return MongoJSONResponse(content=recipe, status_code=201)
     except HTTPException as e:
         raise HTTPException(
             status_code=e.status_code,
@@ -260,8 +341,7 @@ async def get_comments(comment_id: str):
     if result is None:
         raise HTTPException(
             status_code=500, detail="Failed to find comment")
-    serialized_comment = json.loads(json.dumps(result, default=str))
-    return JSONResponse(content=serialized_comment, status_code=200)
+    return MongoJSONResponse(content=result, status_code=200)
 
 
 @router.post("/comment/{recipe_id}", dependencies=[Depends(get_current_session)], status_code=201, tags=["comment"])
@@ -271,8 +351,7 @@ async def register_comment(recipe_id: str, comment: CommentIn, current_user: str
         if result is None:
             raise HTTPException(
                 status_code=500, detail="Failed to insert comment")
-        serialized_comment = json.loads(json.dumps(result, default=str))
-        return JSONResponse(content=serialized_comment, status_code=201)
+        return MongoJSONResponse(content=result, status_code=201)
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=str(e))
@@ -298,8 +377,7 @@ async def update_comment(comment_id: str, comment: CommentIn, current_user: str
         if result is None:
             raise HTTPException(
                 status_code=500, detail="Failed to update comment")
-        serialized_comment = json.loads(json.dumps(result, default=str))
-        return JSONResponse(content=serialized_comment, status_code=201)
+        return MongoJSONResponse(content=result, status_code=201)
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=f"Controller:Failed to update comment{str(e)}")
@@ -312,8 +390,7 @@ async def update_comment_like(comment_id: str, current_user: str = Depends(get_c
         if result is None:
             raise HTTPException(
                 status_code=500, detail="Failed to update comment")
-        serialized_comment = json.loads(json.dumps(result, default=str))
-        return JSONResponse(content=serialized_comment, status_code=201)
+        return MongoJSONResponse(content=result, status_code=201)
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=f"Controller:Failed to update comment{str(e)}")
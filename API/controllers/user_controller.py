@@ -11,26 +11,26 @@ from fastapi import APIRouter, HTTPException, Response, Depends, Query, Request
 from utils.session_manager import (
     SessionManager,
     get_current_session,
+    get_session_manager,
     get_verification_link,
 )
 from utils.response_manager import common_responses
 from utils.email_manager import send_verification_email
-from utils.notification_manager import NotificationManager
+from utils.notification_manager import NotificationManager, get_notification_manager
 
 
 router = APIRouter()
 user_dao = UserDao()
 user_service = UserService(user_dao)
-session_manager = SessionManager()
 
 
 @router.post("/", status_code=201, responses=common_responses)
 async def create_user(
-    user: UserIn, session_manager: SessionManager = Depends(SessionManager)
+    user: UserIn, session_manager: SessionManager = Depends(get_session_manager)
 ):
     await user_service.validate_user_creation(user)
 
-    verification_code = session_manager.create_verification_code(user.email)
+    verification_code = await session_manager.create_verification_code(user.email)
     verification_link = get_verification_link(user.email, verification_code)
 
     send_verification_email(user.email, verification_link)
@@ -177,7 +177,7 @@ async def toggle_subscription(
     follow_user_id: str,
     subscribe: bool = True,
     current_user: str = Depends(get_current_session),
-    notification_manager: NotificationManager = Depends(NotificationManager),
+    notification_manager: NotificationManager = Depends(get_notification_manager),
 ):
     try:
         await user_dao.modify_subscription(current_user, follow_user_id, subscribe)
@@ -185,7 +185,7 @@ async def toggle_subscription(
             follower_name = await user_dao.get_username_by_id(current_user)
             message = f"{follower_name}님이 회원님을 구독하였습니다!"
             # 알림 보내기
-            notification_manager.send_notification(follow_user_id, message)
+            await notification_manager.send_notification(follow_user_id, message)
             return {"message": "구독 완료"}
         else:
             return {"message": "구독 취소 완료"}
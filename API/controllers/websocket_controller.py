@@ -1,54 +1,54 @@
-from fastapi import WebSocket, APIRouter, Path, WebSocketDisconnect
-import aioredis
+from fastapi import Depends, HTTPException, WebSocket, APIRouter, Path, Query, WebSocketDisconnect, status
+from typing import Optional
 import asyncio
-import json
 import logging
 from utils.config import get_settings
+from utils.connection_registry import connection_registry
+from utils.notification_manager import notification_manager, parse_stream_id
+from utils.session_manager import SessionManager, get_current_session, get_session_manager
 
 settings = get_settings()
 
 router = APIRouter()
 
-# WebSocket 연결 관리
-active_connections = {}
-
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 
 
 @router.websocket("/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str = Path(...)):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    user_id: str = Path(...),
+    last_id: Optional[str] = Query(None),
+    session_manager: SessionManager = Depends(get_session_manager),
+):
+    # REST 알림 API 와 같은 세션 쿠키로 인증하고, 본인의 알림 채널에만 연결 허용
+    try:
+        current_user = await get_current_session(websocket, session_manager)
+    except (HTTPException, ValueError):
+        current_user = None
+    if current_user is None or current_user != user_id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    # last_id 를 보낸 클라이언트는 JSON 프레임으로 받고, 그 이후에 쌓인 알림을 먼저 다시 받음 (처음이면 "0")
+    if last_id is not None:
+        try:
+            parse_stream_id(last_id)
+        except ValueError:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
     await websocket.accept()
-    active_connections[user_id] = websocket
-
-    # Redis로부터 알림 받기
-    async def listen_for_notifications():
-        redis = aioredis.from_url(settings.redis_url)
-        pubsub = redis.pubsub(ignore_subscribe_messages=True)
-        await pubsub.subscribe("notifications")
-
-        async def reader():
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    notification = json.loads(message["data"])
-                    target_user_id = notification["user_id"]
-                    if target_user_id in active_connections:
-                        target_websocket = active_connections[target_user_id]
-                        await target_websocket.send_text(notification["message"])
-
-                        # 서버 로그에 메시지 전송 로그 출력
-                        logging.info(
-                            f"메시지를 전송하였습니다. {target_user_id}: {notification['message']}"
-                        )
-
-        reader_task = asyncio.create_task(reader())
-        await reader_task
-        await pubsub.unsubscribe("notifications")
-        redis.close()
-        await redis.wait_closed()
-
-    # 별도의 코루틴으로 Redis 알림 수신 시작
-    listen_task = asyncio.create_task(listen_for_notifications())
+    # 알림 수신은 lifespan 에서 시작한 워커당 하나의 Redis 구독이 담당하고, presence 로 이 워커에 라우팅됨
+    connection = await connection_registry.register(
+        user_id,
+        websocket,
+        last_id,
+        replay_loader=(
+            lambda after: notification_manager.get_notifications(
+                user_id, after=after, limit=settings.notification_inbox_maxlen
+            )
+        ) if last_id is not None else None,
+    )
 
     # Keep-Alive: 주기적으로 ping 메시지 전송
     async def keep_alive(websocket):
@@ -69,6 +69,9 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str = Path(...)):
             # 클라이언트로부터 받은 데이터를 처리하는 로직을 여기에 추가할 수 있습니다.
     except WebSocketDisconnect:
         logging.info(f"WebSocket disconnected: {user_id}")
+    except RuntimeError:
+        # 느린 클라이언트 등으로 서버가 먼저 소켓을 닫은 경우
+        if not connection.closed:
+            raise
     finally:
-        active_connections.pop(user_id)
-        listen_task.cancel()  # Redis listener task를 취소합니다.
+        await connection_registry.unregister(user_id, connection)
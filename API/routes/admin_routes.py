@@ -0,0 +1,6 @@
+from fastapi import APIRouter
+from API.controllers import admin_controller
+
+admin_router = APIRouter()
+
+admin_router.include_router(admin_controller.router)
@@ -3,6 +3,8 @@ from API.routes.user_routes import user_router
 from API.routes.recipe_routes import recipe_router
 from API.routes.verify_routes import verify_router
 from API.routes.websocket_routes import websocket_router
+from API.routes.admin_routes import admin_router
+from API.routes.notification_routes import notification_router
 
 api_router = APIRouter()
 
@@ -11,3 +13,5 @@ api_router.include_router(recipe_router, prefix="/recipes")
 # tags=["recipes"]
 api_router.include_router(verify_router, prefix="/email", tags=["email"])
 api_router.include_router(websocket_router, prefix="/ws", tags=["websocket"])
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
+api_router.include_router(notification_router, prefix="/notifications", tags=["notifications"])
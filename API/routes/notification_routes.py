@@ -0,0 +1,6 @@
+from fastapi import APIRouter
+from API.controllers import notification_controller
+
+notification_router = APIRouter()
+
+notification_router.include_router(notification_controller.router)
@@ -0,0 +1,58 @@
+# 로그인 요청이 몰릴 때 비밀번호 검증이 이벤트 루프 지연에 미치는 영향 비교
+# 실행: python -m benchmarks.password_hashing
+import asyncio
+import time
+
+from utils.config import get_settings
+from utils.hash_manager import Hasher
+
+LOGINS = 50
+TICK_SECONDS = 0.01
+
+
+async def measure_loop_lag(stop: asyncio.Event):
+    # 10ms 마다 깨어나야 하는 작업이 실제로 얼마나 늦게 깨어나는지 기록
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - started - TICK_SECONDS)
+    return lags
+
+
+async def verify_inline(password: str, hashed_password: str):
+    # 변경 전: 코루틴 안에서 bcrypt 를 직접 호출
+    return Hasher.pwd_context.verify(password, hashed_password)
+
+
+async def verify_offloaded(password: str, hashed_password: str):
+    return await Hasher.verify_password(password, hashed_password)
+
+
+async def login_storm(verify, hashed_password: str):
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_loop_lag(stop))
+    await asyncio.sleep(TICK_SECONDS * 3)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(verify("password", hashed_password) for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lags = sorted(await ticker)
+    assert all(results)
+    return elapsed, lags
+
+
+async def main():
+    hashed_password = await Hasher.get_hashed_password("password")
+    print(f"bcrypt rounds={get_settings().bcrypt_rounds}, {LOGINS} concurrent logins")
+    for name, verify in (("inline", verify_inline), ("offloaded", verify_offloaded)):
+        elapsed, lags = await login_storm(verify, hashed_password)
+        p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+        print(
+            f"{name:>10}: total {elapsed * 1000:.0f} ms, "
+            f"loop lag p99 {p99 * 1000:.1f} ms, max {max(lags, default=0.0) * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
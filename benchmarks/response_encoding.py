@@ -0,0 +1,64 @@
+# 160개 레시피 페이지 기준 응답 직렬화 비용 비교
+# 실행: python -m benchmarks.response_encoding
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId, json_util
+from fastapi.responses import JSONResponse
+
+from utils.response_manager import MongoJSONResponse
+
+PAGE_SIZE = 160
+ROUNDS = 200
+
+
+def make_recipe(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "recipe_id": f"recipe-{i}",
+        "recipe_title": f"김치찌개 {i}",
+        "recipe_thumbnail": "https://eliceproject.s3.ap-northeast-2.amazonaws.com/thumbnail.png",
+        "recipe_video": "youtube.com/watch?v=AdMgVkp4OXI",
+        "recipe_description": "묵은지와 돼지고기로 끓인 김치찌개" * 3,
+        "recipe_category": "korean",
+        "recipe_info": {"serving": 2, "time": 30, "level": 1},
+        "recipe_ingredients": [{"name": f"재료{j}", "amount": "1개"} for j in range(10)],
+        "recipe_sequence": [
+            {"step": j, "picture": "url", "description": "재료를 손질한다." * 2} for j in range(8)
+        ],
+        "recipe_tip": "맛있다",
+        "recipe_view": i,
+        "user_id": "test",
+        "user_nickname": "test",
+        "created_at": datetime(2023, 6, 5) + timedelta(minutes=i),
+        "recipe_like": [f"user{j}" for j in range(20)],
+        "recipe_like_count": 20,
+    }
+
+
+def before(recipes):
+    serialized_recipes = json.loads(json.dumps(recipes, default=str))
+    return JSONResponse(content=serialized_recipes).body
+
+
+def before_search(recipes):
+    result = [json_util.loads(json_util.dumps(recipe)) for recipe in recipes]
+    serialized_recipes = json.loads(json.dumps(result, default=str))
+    return JSONResponse(content=serialized_recipes).body
+
+
+def after(recipes):
+    return MongoJSONResponse(content=recipes).body
+
+
+def main():
+    recipes = [make_recipe(i) for i in range(PAGE_SIZE)]
+    assert json.loads(before(recipes)) == json.loads(after(recipes))
+    for name, func in (("before", before), ("before (search)", before_search), ("after", after)):
+        seconds = min(timeit.repeat(lambda: func(recipes), number=ROUNDS, repeat=5)) / ROUNDS
+        print(f"{name:>16}: {seconds * 1000:.3f} ms / {PAGE_SIZE} items")
+
+
+if __name__ == "__main__":
+    main()
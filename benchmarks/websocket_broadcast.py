@@ -0,0 +1,72 @@
+# 접속자 수에 따른 WebSocketManager 브로드캐스트 지연 비교 (가짜 소켓 사용)
+# 실행: python -m benchmarks.websocket_broadcast
+import asyncio
+import time
+from datetime import datetime
+
+from utils.websocket_manager import UserNotification, WebSocketManager
+
+CONNECTIONS = (1000, 10000)
+SEND_LATENCY = 0.0002
+BURST = 20
+
+
+class FakeWebSocket:
+    def __init__(self, latency: float = SEND_LATENCY):
+        self.latency = latency
+        self.frames = 0
+
+    async def send_text(self, data: str):
+        await asyncio.sleep(self.latency)
+        self.frames += 1
+
+    async def send_json(self, data: dict):
+        await self.send_text(str(data))
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+async def send_sequential(manager: WebSocketManager, message: UserNotification):
+    # 변경 전: 소켓마다 순서대로 기다리며 매번 다시 직렬화
+    for connection in manager.active_connections:
+        await connection.send_json(message.dict())
+
+
+def make_manager(count: int) -> WebSocketManager:
+    manager = WebSocketManager(send_timeout=1.0)
+    manager.active_connections = {FakeWebSocket() for _ in range(count)}
+    return manager
+
+
+def make_message(i: int = 0) -> UserNotification:
+    return UserNotification(user_id="test", message=f"새 레시피가 등록되었습니다 {i}", timestamp=datetime.utcnow())
+
+
+async def main():
+    for count in CONNECTIONS:
+        manager = make_manager(count)
+        started = time.perf_counter()
+        await send_sequential(manager, make_message())
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await manager.send_message(make_message())
+        concurrent = time.perf_counter() - started
+
+        # 연속으로 보낸 메시지가 배치 프레임으로 묶이는지 확인
+        manager = make_manager(count)
+        started = time.perf_counter()
+        await asyncio.gather(*(manager.send_message(make_message(i)) for i in range(BURST)))
+        burst = time.perf_counter() - started
+        frames = max(connection.frames for connection in manager.active_connections)
+
+        print(
+            f"{count:>6} connections: sequential {sequential * 1000:.0f} ms, "
+            f"concurrent {concurrent * 1000:.0f} ms, "
+            f"{BURST} messages burst {burst * 1000:.0f} ms in {frames} frames"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
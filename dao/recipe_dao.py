@@ -1,90 +1,254 @@
 from dao.user_dao import UserDao
-from typing import List
+from typing import Dict, List
 from fastapi import HTTPException
 
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from utils.config import get_settings
-from utils.db_manager import MongoDBManager
+from utils.db_manager import MongoDBManager, db_manager as default_db_manager
+from utils.pagination_manager import keyset_query
+from utils.ingredient_normalizer import normalize_ingredient_names, normalize_ingredients
+from utils.cache_manager import author_cache, author_key
 from models.recipe_models import CommentBase, CommentUpdate, RecipeBase, RecipeUpdate, RecipeView, RecipeLike, RecipeCreate
 from datetime import datetime
 settings = get_settings()
 
+# 목록 응답(RecipeGetItem)에 필요한 필드만 조회. 좋아요 목록 대신 좋아요 수를 반환
+RECIPE_CARD_PROJECTION = {
+    "_id": 0,
+    "recipe_title": 1,
+    "recipe_thumbnail": 1,
+    "recipe_id": 1,
+    "recipe_view": 1,
+    "user_id": 1,
+    "user_nickname": 1,
+    "created_at": 1,
+    "recipe_like_count": 1,
+}
+
+
+def card_projection(full: bool = False):
+    return None if full else RECIPE_CARD_PROJECTION
+
+
+def ingredient_query(keys: List[str], match_all: bool = False, excluded_keys: List[str] = None):
+    condition = {"$all": keys} if match_all else {"$in": keys}
+    if excluded_keys:
+        condition["$nin"] = excluded_keys
+    return {"recipe_ingredient_keys": condition}
+
+
+def toggle_like_pipeline(like_field: str, count_field: str, user_id: str):
+    # 좋아요 토글과 좋아요 수 갱신을 한 번의 원자적 업데이트로 처리 (읽고 다시 쓰는 경쟁 상태 방지)
+    likes = {"$ifNull": [f"${like_field}", []]}
+    return [
+        {"$set": {like_field: {
+            "$cond": [
+                {"$in": [user_id, likes]},
+                {"$filter": {"input": likes, "cond": {"$ne": ["$$this", user_id]}}},
+                {"$concatArrays": [likes, [user_id]]}
+            ]
+        }}},
+        {"$set": {count_field: {"$size": f"${like_field}"}}}
+    ]
+
 
 class RecipeDao:
     def __init__(self, db_manager: MongoDBManager = None):
-        self.db_manager = db_manager or MongoDBManager()
-        self.collection = self.db_manager.get_collection("recipes")
-        self.user_collection = self.db_manager.get_collection("users")
-        self.comment_collection = self.db_manager.get_collection("comments")
+        self.db_manager = db_manager or default_db_manager
+
+    # 컬렉션은 사용할 때 가져와 lifespan 에서 만든 공유 클라이언트를 사용
+    @property
+    def collection(self):
+        return self.db_manager.get_collection("recipes")
+
+    @property
+    def user_collection(self):
+        return self.db_manager.get_collection("users")
+
+    @property
+    def comment_collection(self):
+        return self.db_manager.get_collection("comments")
+
+    async def backfill_recipe_like_count(self):
+        # recipe_like_count 필드가 없는 기존 문서에 좋아요 수를 채워 넣음
+        result = await self.collection.update_many(
+            {"recipe_like_count": {"$exists": False}},
+            [{"$set": {"recipe_like_count": {"$size": {"$ifNull": ["$recipe_like", []]}}}}]
+        )
+        return result.modified_count
+
+    async def backfill_comment_count(self, batch_size: int = 1000):
+        # 댓글 컬렉션에서 레시피별 댓글 수를 다시 계산해 저장
+        # 마이그레이션 전에 댓글 $inc 가 0 부터 만든 comment_count 도 바로잡도록 필드 유무와 관계없이 모든 레시피를 비교
+        counts = {}
+        async for group in self.comment_collection.aggregate([
+            {"$group": {"_id": "$comment_parent", "count": {"$sum": 1}}}
+        ]):
+            counts[group["_id"]] = group["count"]
+        cursor = self.collection.find({}, {"_id": 1, "recipe_id": 1, "comment_count": 1}).batch_size(batch_size)
+        operations = []
+        modified = 0
+        async for recipe in cursor:
+            count = counts.get(recipe.get("recipe_id"), 0)
+            if recipe.get("comment_count") == count:
+                continue
+            # 읽은 뒤 댓글 작성/삭제로 값이 바뀐 레시피는 덮어쓰지 않음 (필드가 없으면 None 조건이 일치)
+            operations.append(UpdateOne(
+                {"_id": recipe["_id"], "comment_count": recipe.get("comment_count")},
+                {"$set": {"comment_count": count}}
+            ))
+            if len(operations) >= batch_size:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                modified += result.modified_count
+                operations = []
+        if operations:
+            result = await self.collection.bulk_write(operations, ordered=False)
+            modified += result.modified_count
+        return modified
+
+    async def backfill_ingredient_keys(self, batch_size: int = 1000):
+        # 정규화된 재료 키가 없는 기존 레시피를 batch_size 단위 bulk_write 로 채움
+        cursor = self.collection.find(
+            {"recipe_ingredient_keys": {"$exists": False}},
+            {"_id": 1, "recipe_ingredients.name": 1}
+        ).batch_size(batch_size)
+        operations = []
+        modified = 0
+        async for recipe in cursor:
+            operations.append(UpdateOne(
+                {"_id": recipe["_id"]},
+                {"$set": {"recipe_ingredient_keys": normalize_ingredients(recipe.get("recipe_ingredients"))}}
+            ))
+            if len(operations) >= batch_size:
+                result = await self.collection.bulk_write(operations, ordered=False)
+                modified += result.modified_count
+                operations = []
+        if operations:
+            result = await self.collection.bulk_write(operations, ordered=False)
+            modified += result.modified_count
+        return modified
 
     # get
 
-    async def get_all_recipes(self, skip: int = 0, limit: int = 160):
-        cursor = self.collection.find({}).sort("created_at", -1).skip(skip).limit(limit)
-        result = await cursor.to_list(length=None)
+    async def _find_recipes(self, query: dict, skip: int = 0, limit: int = 160, after=None, full: bool = False):
+        # after 가 주어지면 (created_at, recipe_id) 키셋 페이지네이션으로 skip 없이 조회
+        cursor = self.collection.find(keyset_query(query, after, "recipe_id"), card_projection(full))
+        cursor = cursor.sort([("created_at", DESCENDING), ("recipe_id", DESCENDING)])
+        if after is None and skip:
+            cursor = cursor.skip(skip)
+        return await cursor.limit(limit).to_list(length=None)
+
+    async def get_all_recipes(self, skip: int = 0, limit: int = 160, after=None, full: bool = False):
+        result = await self._find_recipes({}, skip=skip, limit=limit, after=after, full=full)
         return result
 
-    async def get_recipes_by_categories(self, category, skip: int = 0, limit: int = 160):
-        result = await self.collection.find({"recipe_category": category}).sort("created_at", -1).skip(skip).limit(limit).to_list(length=None)
+    async def get_recipes_by_categories(self, category, skip: int = 0, limit: int = 160, after=None, full: bool = False):
+        result = await self._find_recipes({"recipe_category": category}, skip=skip, limit=limit, after=after, full=full)
         return result
 
-    async def get_recipes_by_popularity(self, skip: int = 0, limit: int = 160):
-        pipeline = [
-            {
-                "$addFields": {
-                    "recipe_like_length": { "$size": "$recipe_like" }
-                }
-            },
-            {
-                "$sort": { "recipe_like_length": -1 }
-            },
-            {
-                "$project": {
-                    "recipe_like_length": 0
-                }
-            }
-        ]
-        cursor = self.collection.aggregate(pipeline)
-        results = await cursor.to_list(length=None)
-        results = results[skip:skip+limit]  # 페이지네이션을 위해 결과를 잘라냄
+    async def get_recipes_by_popularity(self, skip: int = 0, limit: int = 160, full: bool = False):
+        results = await self.collection.find({}, card_projection(full)).sort(
+            [("recipe_like_count", DESCENDING), ("created_at", DESCENDING)]
+        ).skip(skip).limit(limit).to_list(length=None)
         return results
 
-    async def get_recipes_by_latest(self, skip: int = 0, limit: int = 160):
-        results = await self.collection.find().sort("created_at", -1).skip(skip).limit(limit).to_list(length=None)
+    async def get_recipes_by_latest(self, skip: int = 0, limit: int = 160, after=None, full: bool = False):
+        results = await self._find_recipes({}, skip=skip, limit=limit, after=after, full=full)
         return results
     
-    async def get_recipes_by_user_id(self, user_id, skip: int = 0, limit: int = 160):
-        result = await self.collection.find(
-            {"user_id": user_id}
-        ).sort("created_at", -1).skip(skip).limit(limit).to_list(length=None)
+    async def get_recipes_by_user_id(self, user_id, skip: int = 0, limit: int = 160, after=None, full: bool = False):
+        result = await self._find_recipes({"user_id": user_id}, skip=skip, limit=limit, after=after, full=full)
         return result
     
-    async def get_recipes_by_single_serving(self, skip: int = 0, limit: int = 160):
-        results = await self.collection.find({"recipe_info.serving": 1}).sort("created_at", -1).skip(skip).limit(limit).to_list(length=None)
+    async def get_recipes_by_single_serving(self, skip: int = 0, limit: int = 160, after=None, full: bool = False):
+        results = await self._find_recipes({"recipe_info.serving": 1}, skip=skip, limit=limit, after=after, full=full)
+        return results
+
+    async def get_recipes_by_vegetarian(self, skip: int = 0, limit: int = 160, after=None, full: bool = False):
+        results = await self._find_recipes({"recipe_category": "vegetarian"}, skip=skip, limit=limit, after=after, full=full)
         return results
 
-    async def get_recipes_by_vegetarian(self, skip: int = 0, limit: int = 160):
-        results = await self.collection.find({"recipe_category": "vegetarian"}).sort("created_at", -1).skip(skip).limit(limit).to_list(length=None)
+    async def get_recipes_by_ingredients(self, ingredients: List[str], match_all: bool = False,
+                                         exclude: List[str] = None, skip: int = 0, limit: int = 160,
+                                         full: bool = False):
+        keys = normalize_ingredient_names(ingredients)
+        excluded_keys = normalize_ingredient_names(exclude or [])
+        pipeline = [
+            {"$match": ingredient_query(keys, match_all, excluded_keys)},
+            # 일치하는 재료 수가 많은 레시피부터 정렬
+            {"$addFields": {
+                "ingredient_match_count": {
+                    "$size": {"$setIntersection": [{"$ifNull": ["$recipe_ingredient_keys", []]}, keys]}
+                }
+            }},
+            {"$sort": {"ingredient_match_count": -1, "created_at": -1, "recipe_id": -1}},
+            {"$skip": skip},
+            {"$limit": limit}
+        ]
+        if not full:
+            pipeline.append({"$project": {**RECIPE_CARD_PROJECTION, "ingredient_match_count": 1}})
+        results = await self.collection.aggregate(pipeline).to_list(length=None)
         return results
 
-    async def get_recipes_by_ingredients(self, value):
+    async def get_recipes_by_recipe_ids(self, recipe_ids: List[str], full: bool = False):
+        # 검색 결과 순서를 유지하도록 조회 후 recipe_ids 순서대로 정렬
+        recipes = await self.collection.find(
+            {"recipe_id": {"$in": recipe_ids}}, card_projection(full)
+        ).to_list(length=None)
+        by_id = {recipe["recipe_id"]: recipe for recipe in recipes}
+        return [by_id[recipe_id] for recipe_id in recipe_ids if recipe_id in by_id]
+
+    async def search_recipes_by_regex(self, value, skip: int = 0, limit: int = 160, full: bool = False):
         pipeline = [
             {"$match": {
                 "$or": [
+                    {"recipe_title": {"$regex": value, "$options": "i"}},
+                    {"recipe_category": {"$regex": value, "$options": "i"}},
+                    {"recipe_description": {"$regex": value, "$options": "i"}},
+                    {"recipe_info": {"$regex": value, "$options": "i"}},
                     {"recipe_ingredients.name": {"$regex": value, "$options": "i"}}
                 ]
-            }}
+            }},
+            {"$skip": skip},
+            {"$limit": limit}
         ]
+        if not full:
+            pipeline.append({"$project": RECIPE_CARD_PROJECTION})
         results = await self.collection.aggregate(pipeline).to_list(length=None)
         return results
-    
+
     async def get_recipe_by_recipe_id(self, recipe_id):
-        recipe = await self.collection.find_one({"recipe_id": recipe_id})
-        user = await self.user_collection.find_one({"user_id": recipe["user_id"]})
-        recipe['user_img'] = user["img"]
-        recipe['user_fan'] = len(user.get('fans', []))
-        recipe['user_subscription'] = len(user.get('subscription', []))
-        return recipe
+        # 레시피와 작성자 요약 정보를 한 번의 aggregation 으로 조회
+        pipeline = [
+            {"$match": {"recipe_id": recipe_id}},
+            {"$limit": 1},
+            {"$lookup": {
+                "from": "users",
+                "localField": "user_id",
+                "foreignField": "user_id",
+                "pipeline": [
+                    {"$limit": 1},
+                    {"$project": {
+                        "_id": 0,
+                        "img": 1,
+                        "fan_count": {"$ifNull": ["$fan_count", {"$size": {"$ifNull": ["$fans", []]}}]},
+                        "subscription_count": {
+                            "$ifNull": ["$subscription_count", {"$size": {"$ifNull": ["$subscriptions", []]}}]
+                        }
+                    }}
+                ],
+                "as": "author"
+            }},
+            {"$addFields": {
+                "user_img": {"$arrayElemAt": ["$author.img", 0]},
+                "user_fan": {"$ifNull": [{"$arrayElemAt": ["$author.fan_count", 0]}, 0]},
+                "user_subscription": {"$ifNull": [{"$arrayElemAt": ["$author.subscription_count", 0]}, 0]}
+            }},
+            {"$project": {"author": 0}}
+        ]
+        results = await self.collection.aggregate(pipeline).to_list(length=1)
+        return results[0] if results else None
 
     async def get_recipe_to_update_recipe(self, id):
         result = await self.collection.find_one({"recipe_id": id})
@@ -92,20 +256,81 @@ class RecipeDao:
             return None
         return RecipeCreate(**result)
 
-    async def get_comments(self, recipe_id):
-        result = await self.comment_collection.find({"comment_parent": recipe_id}).to_list(length=None)
+    async def get_comments(self, recipe_id, after=None, limit: int = 20):
+        # (created_at, comment_id) 오름차순 키셋 페이지네이션
+        query = keyset_query({"comment_parent": recipe_id}, after, "comment_id", direction=1)
+        result = await self.comment_collection.find(query).sort(
+            [("created_at", ASCENDING), ("comment_id", ASCENDING)]
+        ).limit(limit).to_list(length=None)
         return result
 
+    async def get_author_summary(self, user_id):
+        # 작성자 닉네임/프로필 이미지는 자주 바뀌지 않으므로 캐시에서 조회
+        return await author_cache.get_or_load(author_key(user_id), lambda: self.find_author_summary(user_id))
+
+    async def find_author_summary(self, user_id):
+        return await self.user_collection.find_one({"user_id": user_id}, {"_id": 0, "username": 1, "img": 1})
+
+    async def sync_recipe_author(self, user_id, username, batch_size: int = 500):
+        # 닉네임이 바뀐 사용자의 레시피를 batch_size 단위 bulk_write 로 갱신하고, 갱신한 recipe_id 목록을 배치마다 반환
+        cursor = self.collection.find(
+            {"user_id": user_id, "user_nickname": {"$ne": username}}, {"_id": 1, "recipe_id": 1}
+        ).batch_size(batch_size)
+        batch = []
+        async for recipe in cursor:
+            batch.append(recipe)
+            if len(batch) >= batch_size:
+                yield await self._set_recipe_author(batch, username)
+                batch = []
+        if batch:
+            yield await self._set_recipe_author(batch, username)
+
+    async def _set_recipe_author(self, recipes, username):
+        await self.collection.bulk_write([
+            UpdateOne({"_id": recipe["_id"]}, {"$set": {"user_nickname": username}}) for recipe in recipes
+        ], ordered=False)
+        return [recipe["recipe_id"] for recipe in recipes]
+
+    async def sync_comment_author(self, user_id, username, img, batch_size: int = 500):
+        # 댓글에 복사된 닉네임/프로필 이미지를 갱신하고, 영향을 받은 레시피 id 목록을 배치마다 반환
+        cursor = self.comment_collection.find(
+            {
+                "comment_author": user_id,
+                "$or": [{"comment_nickname": {"$ne": username}}, {"comment_profile_img": {"$ne": img}}]
+            },
+            {"_id": 1, "comment_parent": 1}
+        ).batch_size(batch_size)
+        batch = []
+        async for comment in cursor:
+            batch.append(comment)
+            if len(batch) >= batch_size:
+                yield await self._set_comment_author(batch, username, img)
+                batch = []
+        if batch:
+            yield await self._set_comment_author(batch, username, img)
+
+    async def _set_comment_author(self, comments, username, img):
+        await self.comment_collection.bulk_write([
+            UpdateOne(
+                {"_id": comment["_id"]},
+                {"$set": {"comment_nickname": username, "comment_profile_img": img}}
+            ) for comment in comments
+        ], ordered=False)
+        return list({comment["comment_parent"] for comment in comments})
+
      # post
 
     async def register_recipe(self, recipe: RecipeCreate):
-        user = await self.user_collection.find_one({"user_id": recipe.user_id})
+        user = await self.get_author_summary(recipe.user_id)
         user_nickname = user["username"]
         recipe.user_nickname = user_nickname
+        recipe.recipe_ingredient_keys = normalize_ingredients(recipe.recipe_ingredients)
         await self.collection.insert_one(recipe.dict())
         return {"recipe_id": recipe.recipe_id, "full": recipe}
 
     async def register_recipes(self, recipes: List[RecipeCreate]):
+        for recipe in recipes:
+            recipe.recipe_ingredient_keys = normalize_ingredients(recipe.recipe_ingredients)
         recipe_data = [recipe.dict() for recipe in recipes]
         result = await self.collection.insert_many(recipe_data)
         if len(result.inserted_ids) != len(recipe_data):
@@ -115,6 +340,14 @@ class RecipeDao:
             )
         return {"message": "Recipes inserted successfully"}
 
+    async def insert_recipe_batch(self, recipe_data: List[dict]):
+        # 순서 없는 insert_many 로 실패한 문서만 건너뛰고 (index, 오류 메시지) 목록을 반환
+        try:
+            await self.collection.insert_many(recipe_data, ordered=False)
+        except BulkWriteError as e:
+            return [(error["index"], error["errmsg"]) for error in e.details.get("writeErrors", [])]
+        return []
+
     # update
 
     async def update_recipe(self, recipe_id: str, updated_recipe, current_user):
@@ -136,9 +369,13 @@ class RecipeDao:
             recipe_tip=updated_recipe.recipe_tip,
             user_nickname=existing_recipe["user_nickname"]
         )
+        update_data = modified_recipe.dict()
+        update_data["recipe_ingredient_keys"] = normalize_ingredients(updated_recipe.recipe_ingredients)
+        # 검색 인덱스가 마지막 동기화 이후 수정된 레시피만 다시 읽을 수 있도록 수정 시각 기록
+        update_data["updated_at"] = datetime.utcnow()
         updated_document = await self.collection.find_one_and_update(
             {"recipe_id": recipe_id},
-            {"$set": modified_recipe.dict()},
+            {"$set": update_data},
             return_document=ReturnDocument.AFTER
         )
         if updated_document is None:
@@ -170,31 +407,36 @@ class RecipeDao:
         else:
             return 0  # 문서 삭제 실패
 
-    async def update_recipe_view(self, recipe_id: str):
-        update_query = {"$inc": {"recipe_view": 1}}
-        result = await self.collection.update_one({"recipe_id": recipe_id}, update_query)
+    async def increment_recipe_views(self, counts: Dict[str, int]):
+        # 연산 순서는 counts 순서와 같아 BulkWriteError 의 index 로 실패한 레시피를 찾을 수 있음
+        operations = [
+            UpdateOne({"recipe_id": recipe_id}, {"$inc": {"recipe_view": amount}})
+            for recipe_id, amount in counts.items()
+        ]
+        result = await self.collection.bulk_write(operations, ordered=False)
         return result.modified_count
 
     async def update_recipe_like(self, recipe_id: str, current_user):
-        existing_recipe = await self.collection.find_one({"recipe_id": recipe_id})
-        recipe_like = existing_recipe.get("recipe_like", [])
-        if current_user in recipe_like:
-            recipe_like.remove(current_user)
-        else:
-            recipe_like.append(current_user)
-        updated_comment = await self.collection.find_one_and_update(
+        updated_recipe = await self.collection.find_one_and_update(
             {"recipe_id": recipe_id},
-            {"$set": {"recipe_like": recipe_like}},
+            toggle_like_pipeline("recipe_like", "recipe_like_count", current_user),
             return_document=ReturnDocument.AFTER
         )
-        return updated_comment
+        return updated_recipe
+
+    async def get_liked_recipe_ids(self, recipe_ids: List[str], current_user):
+        cursor = self.collection.find(
+            {"recipe_id": {"$in": recipe_ids}, "recipe_like": current_user},
+            {"_id": 0, "recipe_id": 1}
+        )
+        return [recipe["recipe_id"] async for recipe in cursor]
 
     async def get_one_comment(self, comment_id):
         result = await self.comment_collection.find_one({"comment_id": comment_id})
         return result
 
     async def register_comment(self, recipe_id, comment: CommentBase, current_user):
-        user = await self.user_collection.find_one({"user_id": current_user})
+        user = await self.get_author_summary(current_user)
         comment_author = current_user
         comment_nickname = user["username"]
         comment_parent = recipe_id
@@ -208,6 +450,7 @@ class RecipeDao:
             comment_profile_img=comment_profile_img
         )
         await self.comment_collection.insert_one(comment_base.dict())
+        await self.collection.update_one({"recipe_id": recipe_id}, {"$inc": {"comment_count": 1}})
         inserted_data = await self.comment_collection.find_one({"comment_id": comment_base.comment_id})
         return inserted_data
 
@@ -225,7 +468,7 @@ class RecipeDao:
                 status_code=403,
                 detail="You are not authorized to update this comment"
             )
-        user = await self.user_collection.find_one({"user_id": current_user})
+        user = await self.get_author_summary(current_user)
         comment_nickname = user["username"]
         comment_profile_img = user["img"]
         comment_text = modified_comment.comment_text
@@ -242,15 +485,9 @@ class RecipeDao:
         return updated_comment
 
     async def update_comment_like(self, comment_id, current_user):
-        existing_comment = await self.comment_collection.find_one({"comment_id": comment_id})
-        comment_like = existing_comment.get("comment_like", [])
-        if current_user in comment_like:
-            comment_like.remove(current_user)
-        else:
-            comment_like.append(current_user)
         updated_comment = await self.comment_collection.find_one_and_update(
             {"comment_id": comment_id},
-            {"$set": {"comment_like": comment_like}},
+            toggle_like_pipeline("comment_like", "comment_like_count", current_user),
             return_document=ReturnDocument.AFTER
         )
         return updated_comment
@@ -269,6 +506,9 @@ class RecipeDao:
             )
         result = await self.comment_collection.delete_one({"comment_id": comment_id})
         if result.deleted_count == 1:
+            await self.collection.update_one(
+                {"recipe_id": existing_comment["comment_parent"]}, {"$inc": {"comment_count": -1}}
+            )
             return 1  # 문서가 성공적으로 삭제되었을 경우
         else:
             return 0  # 문서 삭제 실패
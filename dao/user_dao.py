@@ -1,16 +1,46 @@
 from utils.config import get_settings
-from utils.db_manager import MongoDBManager
+from utils.db_manager import MongoDBManager, db_manager as default_db_manager
 from models.user_models import UserInDB
 from fastapi import HTTPException
+from pymongo import UpdateOne
 from typing import List
 
 settings = get_settings()
 
 
+def subscribe_operations(current_user: str, follow_user_id: str):
+    return [
+        UpdateOne(
+            {"user_id": current_user, "subscriptions": {"$ne": follow_user_id}},
+            {"$addToSet": {"subscriptions": follow_user_id}, "$inc": {"subscription_count": 1}},
+        ),
+        UpdateOne(
+            {"user_id": follow_user_id, "fans": {"$ne": current_user}},
+            {"$addToSet": {"fans": current_user}, "$inc": {"fan_count": 1}},
+        ),
+    ]
+
+
+def unsubscribe_operations(current_user: str, follow_user_id: str):
+    return [
+        UpdateOne(
+            {"user_id": current_user, "subscriptions": follow_user_id},
+            {"$pull": {"subscriptions": follow_user_id}, "$inc": {"subscription_count": -1}},
+        ),
+        UpdateOne(
+            {"user_id": follow_user_id, "fans": current_user},
+            {"$pull": {"fans": current_user}, "$inc": {"fan_count": -1}},
+        ),
+    ]
+
+
 class UserDao:
     def __init__(self, db_manager: MongoDBManager = None):
-        self.db_manager = db_manager or MongoDBManager()
-        self.collection = self.db_manager.get_collection("users")
+        self.db_manager = db_manager or default_db_manager
+
+    @property
+    def collection(self):
+        return self.db_manager.get_collection("users")
 
     async def create_user_in_db(self, user_in_db: UserInDB):
         # subscriptions와 fans를 set에서 list로 변환 
@@ -33,8 +63,10 @@ class UserDao:
         delete_result = await self.collection.delete_one({"user_id": user_id})
         return delete_result.deleted_count > 0
 
-    async def get_user_by_id(self, user_id: str):
-        user_doc = await self.collection.find_one({"user_id": user_id})
+    async def get_user_by_id(self, user_id: str, with_follows: bool = True):
+        # 로그인 등 구독/팬 목록이 필요 없는 경로에서는 커질 수 있는 배열을 제외하고 조회
+        projection = None if with_follows else {"fans": 0, "subscriptions": 0}
+        user_doc = await self.collection.find_one({"user_id": user_id}, projection)
         if user_doc:
             return UserInDB(**user_doc)
         return None
@@ -46,9 +78,11 @@ class UserDao:
         return None
 
     async def get_username_by_id(self, user_id: str):
-        user = await self.get_user_by_id(user_id)
-        if user:
-            return user.username
+        user_doc = await self.collection.find_one(
+            {"user_id": user_id}, {"_id": 0, "username": 1}
+        )
+        if user_doc:
+            return user_doc["username"]
         return None
 
     async def get_user_by_email_and_birthdate(self, email: str, birthdate: str):
@@ -93,52 +127,48 @@ class UserDao:
     async def modify_subscription(
         self, current_user: str, follow_user_id: str, subscribe: bool
     ) -> None:
-        user = await self.get_user_by_id(current_user)
-        follow_user = await self.get_user_by_id(follow_user_id)
-
-        if not user or not follow_user:
-            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-
         # 구독 체크
         if current_user == follow_user_id:
             raise HTTPException(status_code=400, detail="본인을 구독 할 수 없습니다.")
 
-        if (isinstance(user.subscriptions, (list, set)) and
-            isinstance(follow_user.fans, (list, set))):  # 데이터 타입 체크
-
-            # subscriptions와 fans를 set으로 변환
-            user_subscriptions = set(user.subscriptions)
-            follow_user_fans = set(follow_user.fans)
-
-            if subscribe:
-                if follow_user_id in user_subscriptions:
-                    raise HTTPException(status_code=409, detail="이미 구독 중입니다")
-                else:
-                    user_subscriptions.add(follow_user_id)
-                    follow_user_fans.add(current_user)
-            else:
-                if follow_user_id in user_subscriptions:
-                    user_subscriptions.remove(follow_user_id)
-                    follow_user_fans.remove(current_user)
-                else:
-                    raise HTTPException(status_code=409, detail="구독을 취소할 수 없습니다.")
-
-            user.subscriptions = list(user_subscriptions)
-            follow_user.fans = list(follow_user_fans)
-
-            # Update the database
-            await self.update_user_in_db(
-                current_user, {"subscriptions": user.subscriptions}
-            )
-            await self.update_user_in_db(follow_user_id, {"fans": follow_user.fans})
-
+        # 양쪽 문서를 조건부 $addToSet/$pull 로 한 번의 bulk_write 에서 갱신하고 구독/팬 수도 함께 유지
+        if subscribe:
+            operations = subscribe_operations(current_user, follow_user_id)
         else:
-            raise HTTPException(status_code=500, detail="서버 내부 오류입니다.")     
+            operations = unsubscribe_operations(current_user, follow_user_id)
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        if result.modified_count == len(operations):
+            return
+
+        # 일부만 반영된 경우에만 원인을 확인 (존재하지 않는 사용자 / 이미 구독 중)
+        users = await self.collection.find(
+            {"user_id": {"$in": [current_user, follow_user_id]}}, {"_id": 0, "user_id": 1}
+        ).to_list(length=2)
+        found = {user["user_id"] for user in users}
+        if found != {current_user, follow_user_id}:
+            # 한 쪽 문서만 바뀐 경우 실행한 작업의 반대 작업으로 되돌림 (없는 사용자 쪽 연산은 아무것도 바꾸지 않음)
+            if result.modified_count:
+                inverse = unsubscribe_operations if subscribe else subscribe_operations
+                await self.collection.bulk_write(inverse(current_user, follow_user_id), ordered=False)
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
-        await self.update_user_in_db(
-            current_user, {"subscriptions": user.subscriptions}
+        if result.modified_count == 0:
+            if subscribe:
+                raise HTTPException(status_code=409, detail="이미 구독 중입니다")
+            raise HTTPException(status_code=409, detail="구독을 취소할 수 없습니다.")
+
+    async def backfill_follow_counts(self):
+        # fan_count/subscription_count 를 배열 크기로 다시 계산
+        # 마이그레이션 전에 구독/취소의 $inc 가 0 부터 만든 값도 바로잡도록 필드 유무와 관계없이 모든 사용자를 갱신 (값이 같은 문서는 수정되지 않음)
+        result = await self.collection.update_many(
+            {},
+            [{"$set": {
+                "fan_count": {"$size": {"$ifNull": ["$fans", []]}},
+                "subscription_count": {"$size": {"$ifNull": ["$subscriptions", []]}},
+            }}],
         )
-        await self.update_user_in_db(follow_user_id, {"fans": follow_user.fans})
+        return result.modified_count
 
     async def get_user_details(self, user_ids: List[str]):
         cursor = self.collection.find({"user_id": {"$in": user_ids}})
@@ -175,5 +205,4 @@ class UserDao:
         return user_doc is not None
 
 def get_user_dao() -> UserDao:
-    db_manager = MongoDBManager()
-    return UserDao(db_manager)
+    return UserDao(default_db_manager)
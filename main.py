@@ -1,8 +1,58 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from API.routes.api_routes import api_router
+from dao.recipe_dao import RecipeDao
+from services.profile_sync_service import profile_sync_service
+from services.recipe_import_service import shutdown_validation_pool
+from services.recipe_service import RecipeService
+from utils.cache_manager import author_cache
+from utils.config import get_settings
+from utils.connection_registry import connection_registry
+from utils.db_manager import db_manager
+from utils.index_manager import ensure_indexes
+from utils.redis_manager import close_redis
+from utils.session_manager import session_manager
+from utils.search_engine import search_engine
+from utils.view_count_manager import view_count_manager
 
-app = FastAPI()
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 모든 DAO 가 공유하는 Mongo 클라이언트를 앱 이벤트 루프에서 생성
+    db_manager.connect()
+    recipe_dao = RecipeDao(db_manager)
+    await ensure_indexes(db_manager.database)
+    # 기존 데이터 보정은 배포 시 python -m utils.migration_manager 로 한 번만 실행
+    search_task = asyncio.create_task(
+        search_engine.run(recipe_dao.collection, settings.search_index_refresh_seconds)
+    )
+    view_task = asyncio.create_task(view_count_manager.run(recipe_dao))
+    warm_task = asyncio.create_task(RecipeService(recipe_dao).warm_feed_cache())
+    profile_sync_task = asyncio.create_task(profile_sync_service.run())
+    session_task = asyncio.create_task(session_manager.listen_invalidations())
+    author_cache_task = asyncio.create_task(author_cache.listen_invalidations())
+    notification_task = asyncio.create_task(connection_registry.run())
+    yield
+    tasks = [
+        notification_task, session_task, author_cache_task, profile_sync_task, warm_task, search_task, view_task
+    ]
+    for task in tasks:
+        task.cancel()
+    # 취소된 태스크가 끝날 때까지 기다린 뒤 마지막 flush 를 실행하고 연결을 닫음
+    # (bulk_write 중 취소된 flush 가 되돌린 조회수를 마지막 flush 에 포함하고, 닫힌 클라이언트를 사용하지 않도록)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await view_count_manager.flush(recipe_dao)
+    await connection_registry.clear_presence()
+    db_manager.close()
+    shutdown_validation_pool()
+    await close_redis()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -135,6 +135,9 @@ class RecipeCreate(RecipeBase):
     user_nickname: Optional[str] = Field(default='test')
     created_at: datetime = Field(default_factory=datetime.utcnow)
     recipe_like: Optional[List[str]] = []
+    recipe_like_count: int = Field(default=0)
+    recipe_ingredient_keys: List[str] = []
+    comment_count: int = Field(default=0)
 
     class Config:
         schema_extra = {
@@ -234,6 +237,7 @@ class RecipeGetItem(BaseModel):
     user_nickname: str
     created_at: datetime
     recipe_like: Optional[List[str]] = []
+    recipe_like_count: Optional[int] = 0
 
     class Config:
         schema_extra = {
@@ -245,13 +249,15 @@ class RecipeGetItem(BaseModel):
                 "user_id": "test",
                 "user_nickname": "test",
                 "created_at": "2023-06-05 08:15:13.806000",
-                "recipe_like": "0"
+                "recipe_like": "0",
+                "recipe_like_count": 0
             }
         }
 
 
 class RecipeGetList(BaseModel):
     recipes: List[RecipeGetItem]
+    next_cursor: Optional[str] = None
 
 
 class RecipeView(RecipeBase):
@@ -268,6 +274,7 @@ class CommentBase(BaseModel):
     comment_profile_img: str
     comment_text: str
     comment_like: Optional[List[str]] = []
+    comment_like_count: int = Field(default=0)
     comment_id: str = Field(default_factory=lambda: generate())
     created_at: datetime = Field(default_factory=datetime.utcnow)
     comment_parent: str
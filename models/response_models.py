@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import datetime
 from typing import List, Optional
 
 
@@ -32,3 +33,23 @@ class Customer(BaseModel):
 
 class PeopleResponse(BaseModel):
     people: List[Customer]
+
+
+class Notification(BaseModel):
+    id: str
+    message: str
+    created_at: Optional[datetime]
+
+
+class NotificationList(BaseModel):
+    notifications: List[Notification]
+    unread_count: int
+    next_cursor: Optional[str]
+
+
+class MarkReadRequest(BaseModel):
+    up_to: Optional[str] = None
+
+
+class MarkReadResponse(BaseModel):
+    last_read_id: Optional[str]
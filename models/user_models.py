@@ -58,6 +58,8 @@ class UserOut(UserBase):
 class UserInDB(UserBase):
     hashed_password: str
     created_at: Optional[datetime]
+    fan_count: int = 0
+    subscription_count: int = 0
 
 
 class UserUpdate(UserBase):
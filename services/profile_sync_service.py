@@ -0,0 +1,110 @@
+import asyncio
+import json
+import logging
+
+from redis.exceptions import RedisError
+from dao.recipe_dao import RecipeDao
+from utils.cache_manager import author_cache, author_key, comments_key, feed_cache, recipe_cache, recipe_key
+from utils.config import get_settings
+from utils.redis_manager import redis_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PROFILE_SYNC_QUEUE = "jobs:profile_sync"
+PROFILE_SYNC_PROCESSING = "jobs:profile_sync:processing"
+PROFILE_SYNC_FAILED = "jobs:profile_sync:failed"
+
+
+class ProfileSyncService:
+    # 닉네임/프로필 이미지 변경을 레시피와 댓글의 복사본에 반영하는 백그라운드 작업
+    # 작업은 BLMOVE 로 처리 중 목록에 옮긴 뒤 끝나면 지우므로, 처리 도중 종료되어도 다음 기동 시 다시 실행됨
+    # 같은 작업을 두 번 실행해도 결과가 같도록 이미 반영된 문서는 건너뜀
+    def __init__(self, recipe_dao: RecipeDao):
+        self.recipe_dao = recipe_dao
+
+    async def enqueue(self, user_id: str):
+        # 변경된 값은 작업 시점에 다시 읽으므로 사용자 아이디만 전달
+        await author_cache.invalidate(author_key(user_id))
+        await self._push({"user_id": user_id, "attempts": 0})
+
+    async def _push(self, job: dict):
+        try:
+            await redis_client.rpush(PROFILE_SYNC_QUEUE, json.dumps(job))
+        except RedisError as e:
+            logger.error(f"Failed to enqueue profile sync for {job['user_id']}: {str(e)}")
+
+    async def sync_author(self, user_id: str):
+        # 작업을 받은 워커의 로컬 캐시에 이전 값이 남아 있을 수 있으므로 DB 에서 직접 조회
+        author = await self.recipe_dao.find_author_summary(user_id)
+        if author is None:
+            return
+        await author_cache.invalidate(author_key(user_id))
+        batch_size = settings.profile_sync_batch_size
+        delay = settings.profile_sync_batch_delay_seconds
+        updated = 0
+        async for recipe_ids in self.recipe_dao.sync_recipe_author(user_id, author["username"], batch_size):
+            updated += len(recipe_ids)
+            await recipe_cache.invalidate(*[recipe_key(recipe_id) for recipe_id in recipe_ids])
+            # 대량 변경이 다른 요청의 DB 처리량을 잠식하지 않도록 배치 사이에 쉼
+            await asyncio.sleep(delay)
+        async for recipe_ids in self.recipe_dao.sync_comment_author(
+            user_id, author["username"], author.get("img"), batch_size
+        ):
+            await recipe_cache.invalidate(
+                *[comments_key(recipe_id) for recipe_id in recipe_ids],
+                *[recipe_key(recipe_id) for recipe_id in recipe_ids]
+            )
+            await asyncio.sleep(delay)
+        if updated:
+            # 피드 카드에 작성자 닉네임이 포함되어 있으므로 피드 캐시도 무효화
+            await feed_cache.bump_version()
+
+    async def recover(self):
+        # 이전 프로세스가 처리하던 중 종료된 작업을 대기열로 되돌림
+        try:
+            while await redis_client.lmove(PROFILE_SYNC_PROCESSING, PROFILE_SYNC_QUEUE, "LEFT", "RIGHT"):
+                pass
+        except RedisError as e:
+            logger.error(f"Failed to recover profile sync jobs: {str(e)}")
+
+    async def run(self):
+        await self.recover()
+        while True:
+            try:
+                raw = await redis_client.blmove(
+                    PROFILE_SYNC_QUEUE, PROFILE_SYNC_PROCESSING, timeout=5, src="LEFT", dest="RIGHT"
+                )
+            except RedisError as e:
+                logger.error(f"Failed to read profile sync queue: {str(e)}")
+                await asyncio.sleep(5)
+                continue
+            if raw is None:
+                continue
+            job = json.loads(raw)
+            try:
+                await self.sync_author(job["user_id"])
+            except Exception as e:
+                logger.error(f"Failed to sync profile of {job['user_id']}: {str(e)}")
+                await self._retry(job)
+            try:
+                await redis_client.lrem(PROFILE_SYNC_PROCESSING, 1, raw)
+            except RedisError as e:
+                logger.error(f"Failed to acknowledge profile sync job: {str(e)}")
+
+    async def _retry(self, job: dict):
+        # 계속 실패하는 작업은 max_attempts 이후 실패 목록으로 옮기고 더 이상 재시도하지 않음
+        job = {**job, "attempts": job.get("attempts", 0) + 1}
+        if job["attempts"] >= settings.profile_sync_max_attempts:
+            logger.error(f"Giving up profile sync of {job['user_id']} after {job['attempts']} attempts")
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    await pipe.rpush(PROFILE_SYNC_FAILED, json.dumps(job)).ltrim(PROFILE_SYNC_FAILED, -1000, -1).execute()
+            except RedisError as e:
+                logger.error(f"Failed to record failed profile sync job: {str(e)}")
+            return
+        await asyncio.sleep(5)
+        await self._push(job)
+
+
+profile_sync_service = ProfileSyncService(RecipeDao())
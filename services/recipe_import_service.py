@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import multiprocessing
+import tempfile
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, AsyncIterator, List, Optional, Tuple
+
+from dao.recipe_dao import RecipeDao
+from utils.cache_manager import feed_cache
+from utils.config import get_settings
+from utils.recipe_validator import validate_recipe_lines
+from utils.search_engine import search_engine
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_validation_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_validation_pool() -> ProcessPoolExecutor:
+    # pydantic v1 검증은 GIL 을 잡고 있어 스레드로는 병렬화되지 않으므로 별도 프로세스에서 실행
+    # 이벤트 루프/드라이버 스레드가 있는 프로세스를 fork 하지 않도록 spawn 사용
+    global _validation_pool
+    if _validation_pool is None:
+        _validation_pool = ProcessPoolExecutor(
+            max_workers=settings.import_validation_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _validation_pool
+
+
+def shutdown_validation_pool():
+    global _validation_pool
+    if _validation_pool is not None:
+        _validation_pool.shutdown(wait=False, cancel_futures=True)
+        _validation_pool = None
+
+
+async def spool_body(stream: AsyncIterator[bytes]) -> IO[bytes]:
+    # StreamingResponse 는 응답 중 receive 에서 연결 종료를 기다리며 요청 본문 메시지도 가져가므로
+    # 응답을 시작하기 전에 본문을 모두 받아 둠 (일정 크기를 넘으면 임시 파일로 기록)
+    body = tempfile.SpooledTemporaryFile(max_size=settings.import_spool_max_memory_bytes)
+    try:
+        async for chunk in stream:
+            body.write(chunk)
+    except BaseException:
+        body.close()
+        raise
+    body.seek(0)
+    return body
+
+
+async def iter_file_chunks(body: IO[bytes], chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    try:
+        while True:
+            chunk = body.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+            await asyncio.sleep(0)
+    finally:
+        body.close()
+
+
+async def iter_ndjson_batches(stream: AsyncIterator[bytes], batch_size: int):
+    # 요청 본문을 한 번에 읽지 않고 줄 단위로 잘라 batch_size 개씩 전달
+    buffer = b""
+    batch = []
+    line_number = 0
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                batch.append((line_number, line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if buffer.strip():
+        batch.append((line_number + 1, buffer))
+    if batch:
+        yield batch
+
+
+async def validate_batch(lines: List[Tuple[int, bytes]], workers: int = None):
+    # 배치를 워커 수만큼 나눠 풀의 모든 프로세스에서 동시에 검증하고, 줄 순서대로 합침
+    workers = workers or settings.import_validation_workers
+    loop = asyncio.get_running_loop()
+    pool = get_validation_pool()
+    size = max(1, -(-len(lines) // workers))
+    results = await asyncio.gather(*(
+        loop.run_in_executor(pool, validate_recipe_lines, lines[start:start + size])
+        for start in range(0, len(lines), size)
+    ))
+    documents = []
+    errors = []
+    for chunk_documents, chunk_errors in results:
+        documents.extend(chunk_documents)
+        errors.extend(chunk_errors)
+    return documents, errors
+
+
+class RecipeImportService:
+    def __init__(self, recipe_dao: RecipeDao):
+        self.recipe_dao = recipe_dao
+
+    async def import_recipes(self, stream: AsyncIterator[bytes], batch_size: int = None):
+        batch_size = batch_size or settings.import_batch_size
+        totals = {"received": 0, "inserted": 0, "failed": 0}
+        insert_task = None
+        batch_number = 0
+        try:
+            async for lines in iter_ndjson_batches(stream, batch_size):
+                # 이전 배치를 DB 에 쓰는 동안 다음 배치를 검증
+                documents, errors = await validate_batch(lines)
+                if insert_task is not None:
+                    yield await self._progress(insert_task, totals)
+                batch_number += 1
+                totals["received"] += len(lines)
+                insert_task = asyncio.create_task(self._insert_batch(batch_number, documents, errors))
+            if insert_task is not None:
+                yield await self._progress(insert_task, totals)
+                insert_task = None
+        finally:
+            if insert_task is not None:
+                insert_task.cancel()
+            if totals["inserted"]:
+                await feed_cache.bump_version()
+        yield {"done": True, **totals}
+
+    async def _insert_batch(self, batch_number: int, documents, errors):
+        inserted = []
+        # 가져온 레시피는 원본의 created_at 을 유지하므로, 다른 워커의 검색 인덱스 갱신에서 찾을 수 있도록 수정 시각 기록
+        updated_at = datetime.utcnow()
+        for _, document in documents:
+            document["updated_at"] = updated_at
+        if documents:
+            try:
+                write_errors = await self.recipe_dao.insert_recipe_batch(
+                    [document for _, document in documents]
+                )
+            except Exception as e:
+                logger.error(f"Failed to import recipe batch {batch_number}: {str(e)}")
+                write_errors = [(index, str(e)) for index in range(len(documents))]
+            failed_indexes = set()
+            for index, message in write_errors:
+                failed_indexes.add(index)
+                errors.append({"line": documents[index][0], "error": message})
+            inserted = [document for index, (_, document) in enumerate(documents) if index not in failed_indexes]
+        for document in inserted:
+            search_engine.add(document)
+        errors.sort(key=lambda error: error["line"])
+        return {"batch": batch_number, "inserted": len(inserted), "failed": len(errors), "errors": errors}
+
+    async def _progress(self, insert_task, totals: dict):
+        progress = await insert_task
+        totals["inserted"] += progress["inserted"]
+        totals["failed"] += progress["failed"]
+        return progress
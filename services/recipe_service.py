@@ -2,15 +2,15 @@ from typing import List
 
 from fastapi import HTTPException
 from utils.config import get_settings
-from utils.db_manager import MongoDBManager
-from models.recipe_models import RecipeBase, RecipeView, RecipeLike, RecipeCreate
+from models.recipe_models import Category, RecipeBase, RecipeView, RecipeLike, RecipeCreate
 from dao.recipe_dao import RecipeDao
+from utils.search_engine import search_engine
+from utils.view_count_manager import view_count_manager
+from utils.cache_manager import comments_key, feed_cache, recipe_cache, recipe_key
+import asyncio
 import logging
 
 settings = get_settings()
-db_manager = MongoDBManager()
-collection = db_manager.get_collection("recipes")
-
 recipe_dao = RecipeDao()
 logger = logging.getLogger(__name__)
 
@@ -19,9 +19,12 @@ class RecipeService:
     def __init__(self, recipe_dao: RecipeDao):
         self.recipe_dao = recipe_dao
 
-    async def get_all_recipes(self,skip: int = 0, limit: int = 160):
+    async def get_all_recipes(self, skip: int = 0, limit: int = 160, after=None, full: bool = False):
         try:
-            result = await self.recipe_dao.get_all_recipes(skip=skip, limit=limit)
+            result = await feed_cache.get_or_load(
+                "all", (skip, limit, after, full),
+                lambda: self.recipe_dao.get_all_recipes(skip=skip, limit=limit, after=after, full=full)
+            )
             return result
         except Exception as e:
             logger.error(f"Failed to get all recipes: {str(e)}")
@@ -30,9 +33,12 @@ class RecipeService:
                 detail="Failed to get all recipes"
             )
 
-    async def get_recipes_by_categories(self, category, skip: int = 0, limit: int = 160):
+    async def get_recipes_by_categories(self, category, skip: int = 0, limit: int = 160, after=None, full: bool = False):
         try:
-            result = await self.recipe_dao.get_recipes_by_categories(category, skip=skip, limit=limit)
+            result = await feed_cache.get_or_load(
+                "categories", (category, skip, limit, after, full),
+                lambda: self.recipe_dao.get_recipes_by_categories(category, skip=skip, limit=limit, after=after, full=full)
+            )
             return result
         except Exception as e:
             logger.error(f"Failed to get recipes by categories: {str(e)}")
@@ -41,9 +47,12 @@ class RecipeService:
                 detail="Failed to get recipes by categories"
             )
 
-    async def get_recipes_by_popularity(self, skip: int = 0, limit: int = 160):
+    async def get_recipes_by_popularity(self, skip: int = 0, limit: int = 160, full: bool = False):
         try:
-            results = await self.recipe_dao.get_recipes_by_popularity(skip=skip, limit=limit)
+            results = await feed_cache.get_or_load(
+                "popularity", (skip, limit, full),
+                lambda: self.recipe_dao.get_recipes_by_popularity(skip=skip, limit=limit, full=full)
+            )
             return results
         except Exception as e:
             logger.error(f"Failed to get recipes by popularity: {str(e)}")
@@ -52,9 +61,12 @@ class RecipeService:
                 detail="Failed to get recipes by popularity"
             )
 
-    async def get_recipes_by_latest(self, skip: int = 0, limit: int = 160):
+    async def get_recipes_by_latest(self, skip: int = 0, limit: int = 160, after=None, full: bool = False):
         try:
-            results = await self.recipe_dao.get_recipes_by_latest(skip=skip, limit=limit)
+            results = await feed_cache.get_or_load(
+                "latest", (skip, limit, after, full),
+                lambda: self.recipe_dao.get_recipes_by_latest(skip=skip, limit=limit, after=after, full=full)
+            )
             return results
         except Exception as e:
             logger.error(f"Failed to get recipes by latest: {str(e)}")
@@ -63,9 +75,9 @@ class RecipeService:
                 detail="Failed to get recipes by latest"
             )
         
-    async def get_recipes_by_user_id(self, user_id, skip: int = 0, limit: int = 160):
+    async def get_recipes_by_user_id(self, user_id, skip: int = 0, limit: int = 160, after=None, full: bool = False):
         try:
-            result = await self.recipe_dao.get_recipes_by_user_id(user_id, skip=skip, limit=limit)
+            result = await self.recipe_dao.get_recipes_by_user_id(user_id, skip=skip, limit=limit, after=after, full=full)
             return result
         except Exception as e:
             logger.error(f"Failed to get recipes by user id: {str(e)}")
@@ -74,9 +86,12 @@ class RecipeService:
                 detail="Failed to get recipes by user id"
             )
         
-    async def get_recipes_by_single_serving(self, skip: int = 0, limit: int = 160):
+    async def get_recipes_by_single_serving(self, skip: int = 0, limit: int = 160, after=None, full: bool = False):
         try:
-            results = await self.recipe_dao.get_recipes_by_single_serving(skip=skip, limit=limit)
+            results = await feed_cache.get_or_load(
+                "single", (skip, limit, after, full),
+                lambda: self.recipe_dao.get_recipes_by_single_serving(skip=skip, limit=limit, after=after, full=full)
+            )
             return results
         except Exception as e:
             logger.error(f"Failed to get recipes by single serving: {str(e)}")
@@ -85,9 +100,12 @@ class RecipeService:
                 detail="Failed to get recipes by single serving"
             )
 
-    async def get_recipes_by_vegetarian(self, skip: int = 0, limit: int = 160):
+    async def get_recipes_by_vegetarian(self, skip: int = 0, limit: int = 160, after=None, full: bool = False):
         try:
-            results = await self.recipe_dao.get_recipes_by_vegetarian(skip=skip, limit=limit)
+            results = await feed_cache.get_or_load(
+                "vegetarian", (skip, limit, after, full),
+                lambda: self.recipe_dao.get_recipes_by_vegetarian(skip=skip, limit=limit, after=after, full=full)
+            )
             return results
         except Exception as e:
             logger.error(f"Failed to get recipes by vegetarian: {str(e)}")
@@ -96,9 +114,28 @@ class RecipeService:
                 detail="Failed to get recipes by vegetarian"
             )
 
-    async def get_recipes_by_ingredients(self, value):
+    async def warm_feed_cache(self):
+        # 서버 기동 시 각 피드의 첫 페이지를 미리 캐시에 채움
+        loaders = [
+            self.get_all_recipes(),
+            self.get_recipes_by_latest(),
+            self.get_recipes_by_popularity(),
+            self.get_recipes_by_single_serving(),
+            self.get_recipes_by_vegetarian(),
+        ]
+        loaders.extend(self.get_recipes_by_categories(category.value) for category in Category)
+        results = await asyncio.gather(*loaders, return_exceptions=True)
+        failed = [result for result in results if isinstance(result, Exception)]
+        if failed:
+            logger.error(f"Failed to warm {len(failed)} feed pages: {failed[0]}")
+
+    async def get_recipes_by_ingredients(self, ingredients: List[str], match_all: bool = False,
+                                         exclude: List[str] = None, skip: int = 0, limit: int = 160,
+                                         full: bool = False):
         try:
-            results = await self.recipe_dao.get_recipes_by_ingredients(value)
+            results = await self.recipe_dao.get_recipes_by_ingredients(
+                ingredients, match_all=match_all, exclude=exclude, skip=skip, limit=limit, full=full
+            )
             return results
         except Exception as e:
             logger.error(f"Failed to get recipes by ingredients: {str(e)}")
@@ -107,9 +144,31 @@ class RecipeService:
                 detail="Failed to get recipes by ingredients"
             )
 
+    async def search_recipes(self, value, skip: int = 0, limit: int = 160, full: bool = False):
+        try:
+            # 인덱스가 준비되기 전(서버 기동 직후)에는 기존 정규식 검색으로 대체
+            if not search_engine.ready:
+                return await self.recipe_dao.search_recipes_by_regex(value, skip=skip, limit=limit, full=full)
+            recipe_ids = search_engine.search(value, skip=skip, limit=limit)
+            if not recipe_ids:
+                return []
+            return await self.recipe_dao.get_recipes_by_recipe_ids(recipe_ids, full=full)
+        except Exception as e:
+            logger.error(f"Failed to search recipes: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to search recipes"
+            )
+
     async def get_recipe_by_recipe_id(self, recipe_id):
         try:
-            result = await self.recipe_dao.get_recipe_by_recipe_id(recipe_id)
+            result = await recipe_cache.get_or_load(
+                recipe_key(recipe_id),
+                lambda: self.recipe_dao.get_recipe_by_recipe_id(recipe_id)
+            )
+            if result is not None:
+                # 아직 DB 에 반영되지 않은 조회수를 더해 거의 실시간 값으로 반환
+                result["recipe_view"] = result.get("recipe_view", 0) + view_count_manager.get_pending(recipe_id)
             return result
         except Exception as e:
             logger.error(f"Failed to get recipe by recipe id: {str(e)}")
@@ -133,7 +192,22 @@ class RecipeService:
 
     async def get_comments(self, recipe_id):
         try:
-            result = await self.recipe_dao.get_comments(recipe_id)
+            # 상세 페이지에 포함되는 첫 페이지만 캐시
+            result = await recipe_cache.get_or_load(
+                comments_key(recipe_id),
+                lambda: self.recipe_dao.get_comments(recipe_id, limit=settings.detail_comment_limit)
+            )
+            return result
+        except Exception as e:
+            logger.error(f"Failed to get comments: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to get comments"
+            )
+
+    async def get_comments_page(self, recipe_id, after=None, limit: int = 20):
+        try:
+            result = await self.recipe_dao.get_comments(recipe_id, after=after, limit=limit)
             return result
         except Exception as e:
             logger.error(f"Failed to get comments: {str(e)}")
@@ -163,6 +237,8 @@ class RecipeService:
     async def register_recipe(self, recipe: RecipeCreate):
         try:
             result = await self.recipe_dao.register_recipe(recipe)
+            search_engine.add(recipe.dict())
+            await feed_cache.bump_version()
             return result
         except Exception as e:
             logger.error(f"Failed to register recipe: {str(e)}")
@@ -185,6 +261,7 @@ class RecipeService:
     async def register_comment(self, recipe_id, comment, current_user):
         try:
             result = await self.recipe_dao.register_comment(recipe_id, comment, current_user)
+            await recipe_cache.invalidate(recipe_key(recipe_id), comments_key(recipe_id))
             return result
         except Exception as e:
             logger.error(f"Failed to register comment: {str(e)}")
@@ -197,6 +274,9 @@ class RecipeService:
     async def update_recipe(self, recipe_id, updated_recipe, current_user):
         try:
             result = await self.recipe_dao.update_recipe(recipe_id, updated_recipe, current_user)
+            search_engine.add(result)
+            await recipe_cache.invalidate(recipe_key(recipe_id))
+            await feed_cache.bump_version()
             return result
         except Exception as e:
             logger.error(f"Failed to update recipe: {str(e)}")
@@ -207,8 +287,8 @@ class RecipeService:
 
     async def update_recipe_view(self, recipe_id: str):
         try:
-            result = await self.recipe_dao.update_recipe_view(recipe_id)
-            return result
+            view_count_manager.increment(recipe_id)
+            return 1
         except Exception as e:
             logger.error(f"Failed to update recipe view: {str(e)}")
             raise HTTPException(
@@ -219,6 +299,7 @@ class RecipeService:
     async def update_recipe_like(self, recipe_id: str, current_user):
         try:
             result = await self.recipe_dao.update_recipe_like(recipe_id, current_user)
+            await recipe_cache.invalidate(recipe_key(recipe_id))
             return result
         except Exception as e:
             logger.error(f"Failed to update recipe like: {str(e)}")
@@ -227,9 +308,22 @@ class RecipeService:
                 detail="Failed to update recipe like"
             )
 
+    async def get_liked_recipe_ids(self, recipe_ids: List[str], current_user):
+        try:
+            result = await self.recipe_dao.get_liked_recipe_ids(recipe_ids, current_user)
+            return result
+        except Exception as e:
+            logger.error(f"Failed to get liked recipes: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to get liked recipes"
+            )
+
     async def update_comment(self, comment_id, comment, current_user):
         try:
             result = await self.recipe_dao.update_comment(comment_id, comment, current_user)
+            if result is not None:
+                await recipe_cache.invalidate(comments_key(result["comment_parent"]))
             return result
         except Exception as e:
             logger.error(f"service : Failed to update comment: {str(e)}")
@@ -241,6 +335,8 @@ class RecipeService:
     async def update_comment_like(self, comment_id, current_user):
         try:
             result = await self.recipe_dao.update_comment_like(comment_id, current_user)
+            if result is not None:
+                await recipe_cache.invalidate(comments_key(result["comment_parent"]))
             return result
         except Exception as e:
             logger.error(f"service : Failed to update comment: {str(e)}")
@@ -253,6 +349,10 @@ class RecipeService:
     async def delete_one_recipe(self, recipe_id: str, current_user):
         try:
             result = await self.recipe_dao.delete_one_recipe(recipe_id, current_user)
+            if result == 1:
+                search_engine.remove(recipe_id)
+                await recipe_cache.invalidate(recipe_key(recipe_id), comments_key(recipe_id))
+                await feed_cache.bump_version()
             return result
         except Exception as e:
             logger.error(f"Failed to delete recipe: {str(e)}")
@@ -274,7 +374,11 @@ class RecipeService:
 
     async def delete_comment(self, comment_id, current_user):
         try:
+            comment = await self.recipe_dao.get_one_comment(comment_id)
             result = await self.recipe_dao.delete_comment(comment_id, current_user)
+            if result == 1:
+                recipe_id = comment["comment_parent"]
+                await recipe_cache.invalidate(recipe_key(recipe_id), comments_key(recipe_id))
             return result
         except Exception as e:
             logger.error(f"Failed to delete comment: {str(e)}")
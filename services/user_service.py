@@ -1,27 +1,25 @@
 from models.user_models import UserIn, UserInDB, UserUpdate
 from utils.hash_manager import Hasher
-from utils.session_manager import SessionManager
+from utils.session_manager import SessionManager, session_manager
 from dao.user_dao import UserDao, get_user_dao
 from fastapi import HTTPException, Response, Depends
 from utils.config import get_settings
 from utils.permission_manager import check_user_permissions
+from services.profile_sync_service import profile_sync_service
+from utils.redis_manager import redis_client
 import secrets
-import secrets
-import redis
 
 settings = get_settings()
 
-redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-
 
 MAX_LOGIN_ATTEMPTS = 5
 LOGIN_TIMEOUT = 3600
 
 
 class UserService:
-    def __init__(self, user_dao: UserDao):
+    def __init__(self, user_dao: UserDao, session_manager: SessionManager = session_manager):
         self.user_dao = user_dao
-        self.session_manager = SessionManager()
+        self.session_manager = session_manager
         self.response = Response()
 
     async def create_user(cls, user: UserIn):
@@ -35,14 +33,14 @@ class UserService:
         self, user_id: str, password: str, session_id: str, current_user: str
     ):
         check_user_permissions(user_id, current_user)
-        user = await self.user_dao.get_user_by_id(user_id)
+        user = await self.user_dao.get_user_by_id(user_id, with_follows=False)
         if not user:
             raise HTTPException(status_code=404, detail=f"사용자 아이디가 존재하지 않습니다.")
 
-        if not Hasher.verify_password(password, user.hashed_password):
+        if not await Hasher.verify_password(password, user.hashed_password):
             raise HTTPException(status_code=401, detail=f"비밀번호가 일치하지 않습니다.")
 
-        self.session_manager.delete_session(session_id)
+        await self.session_manager.delete_session(session_id)
         return await self.user_dao.delete_user(user_id)
 
     async def update_user(self, user: UserUpdate, current_user):
@@ -57,7 +55,7 @@ class UserService:
             and user.email is not None
             and user.email != current_user_in_db.email
         ):
-            if not self.session_manager.check_verification_code(
+            if not await self.session_manager.check_verification_code(
                 user.email, user.email_code
             ):
                 raise Exception("잘못된 인증 코드입니다.")
@@ -72,31 +70,42 @@ class UserService:
             update_data["hashed_password"] = hashed_password
 
         await self.user_dao.update_user_in_db(user.user_id, update_data)
+        # 레시피/댓글에 복사된 닉네임, 프로필 이미지는 백그라운드에서 갱신
+        if any(
+            field in update_data and update_data[field] != getattr(current_user_in_db, field)
+            for field in ("username", "img")
+        ):
+            await profile_sync_service.enqueue(user.user_id)
         updated_user = await self.user_dao.get_user_by_id(user.user_id)
         return updated_user
 
     async def login(self, user_id: str, password: str):
         timeout_key = f"timeout:{user_id}"
-        remaining_time = redis_client.ttl(timeout_key)
+        remaining_time = await redis_client.ttl(timeout_key)
         if remaining_time > 0:
             raise HTTPException(
                 status_code=429,
                 detail=f"로그인 시도가 초과되었습니다. {remaining_time}초 후에 다시 시도해주세요.",
             )
 
-        user = await self.user_dao.get_user_by_id(user_id)
+        user = await self.user_dao.get_user_by_id(user_id, with_follows=False)
         if not user:
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        if not Hasher.verify_password(password, user.hashed_password):
+        is_valid, new_hash = await Hasher.verify_and_update(password, user.hashed_password)
+        if not is_valid:
             failed_key = f"failed:{user_id}"
-            failed_attempts = redis_client.incr(failed_key)
+            failed_attempts = await redis_client.incr(failed_key)
             if failed_attempts >= MAX_LOGIN_ATTEMPTS:
-                redis_client.set(timeout_key, "1", LOGIN_TIMEOUT)
-                redis_client.delete(failed_key)
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    await pipe.set(timeout_key, "1", LOGIN_TIMEOUT).delete(failed_key).execute()
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        session_id = self.session_manager.create_session(user.user_id)
+        if new_hash:
+            # 설정된 해시 비용이 바뀐 경우 새 비용으로 다시 계산한 해시를 저장
+            await self.user_dao.update_user_in_db(user.user_id, {"hashed_password": new_hash})
+
+        session_id = await self.session_manager.create_session(user.user_id)
         return {"session_id": session_id}
 
     async def logout(self, session_id: str, response: Response):
@@ -0,0 +1,13 @@
+import os
+
+# Settings 필수 값. 테스트는 실제 Mongo/Redis 에 연결하지 않음
+for name, value in {
+    "MONGO_DB_URL": "mongodb://localhost:27017",
+    "MONGO_DB_NAME": "matissue_test",
+    "REDIS_URL": "redis://localhost:6379",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "SENDER_EMAIL": "test@example.com",
+    "SMTP_PASSWORD": "test",
+}.items():
+    os.environ.setdefault(name, value)
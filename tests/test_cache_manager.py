@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from utils.cache_manager import FeedCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+
+def make_cache():
+    return FeedCache(FakeRedis(), ttl=30, version_ttl=0)
+
+
+def test_concurrent_misses_load_once():
+    async def run():
+        cache = make_cache()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return [{"recipe_id": "r1"}]
+
+        results = await asyncio.gather(*(cache.get_or_load("latest", (0, 20), loader) for _ in range(10)))
+        assert calls == 1
+        assert results == [[{"recipe_id": "r1"}]] * 10
+        assert cache.coalesced == 9
+        assert cache.inflight == {}
+        # 채워진 뒤에는 Redis 캐시에서 읽음
+        assert await cache.get_or_load("latest", (0, 20), loader) == [{"recipe_id": "r1"}]
+        assert calls == 1
+
+    asyncio.run(run())
+
+
+def test_loader_error_is_shared_and_not_cached():
+    async def run():
+        cache = make_cache()
+        calls = 0
+
+        async def failing_loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_load("latest", (0, 20), failing_loader) for _ in range(3)), return_exceptions=True
+        )
+        assert calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        async def loader():
+            return ["ok"]
+
+        assert await cache.get_or_load("latest", (0, 20), loader) == ["ok"]
+
+    asyncio.run(run())
+
+
+def test_cancelled_filler_lets_waiter_retry():
+    async def run():
+        cache = make_cache()
+        started = asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def loader():
+            return ["ok"]
+
+        filler = asyncio.create_task(cache.get_or_load("latest", (0, 20), slow_loader))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_load("latest", (0, 20), loader))
+        await asyncio.sleep(0)
+        filler.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await filler
+        assert await waiter == ["ok"]
+
+    asyncio.run(run())
+
+
+def test_bump_version_changes_key():
+    async def run():
+        cache = make_cache()
+
+        async def loader():
+            return ["v1"]
+
+        await cache.get_or_load("latest", (0, 20), loader)
+        await cache.bump_version()
+
+        async def reloaded():
+            return ["v2"]
+
+        assert await cache.get_or_load("latest", (0, 20), reloaded) == ["v2"]
+
+    asyncio.run(run())
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+import utils.connection_registry as connection_registry_module
+from utils.connection_registry import Connection, parse_stream_id
+
+
+def test_parse_stream_id():
+    assert parse_stream_id("1700000000000-5") == (1700000000000, 5)
+    assert parse_stream_id("1700000000000") == (1700000000000, 0)
+
+
+def test_parse_stream_id_orders_by_sequence_numerically():
+    assert parse_stream_id("1700000000000-10") > parse_stream_id("1700000000000-9")
+    assert parse_stream_id("1700000000001-0") > parse_stream_id("1700000000000-99")
+
+
+@pytest.mark.parametrize("stream_id", ["", "abc", "1-2-3", "1-x"])
+def test_parse_stream_id_rejects_invalid(stream_id):
+    with pytest.raises(ValueError):
+        parse_stream_id(stream_id)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+        self.closed_with = None
+        self.blocked = asyncio.Event()
+
+    async def send_text(self, data: str):
+        await self.blocked.wait()
+        self.frames.append(data)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+@pytest.fixture
+def small_queue(monkeypatch):
+    monkeypatch.setattr(connection_registry_module.settings, "websocket_send_queue_size", 2)
+    return monkeypatch
+
+
+def fill(connection: Connection, count: int):
+    return [connection.enqueue({"id": None, "message": f"알림 {index}"}) for index in range(count)]
+
+
+def test_full_queue_drops_new_notifications(small_queue):
+    small_queue.setattr(connection_registry_module.settings, "websocket_slow_consumer_policy", "drop")
+
+    async def run():
+        websocket = FakeWebSocket()
+        connection = Connection(websocket)
+        accepted = fill(connection, 4)
+        return connection, websocket, accepted
+
+    connection, websocket, accepted = asyncio.run(run())
+    assert accepted == [True, True, False, False]
+    assert connection.dropped == 2
+    assert not connection.closed
+    assert websocket.closed_with is None
+
+
+def test_full_queue_disconnects_slow_consumer(small_queue):
+    small_queue.setattr(connection_registry_module.settings, "websocket_slow_consumer_policy", "disconnect")
+
+    async def run():
+        websocket = FakeWebSocket()
+        connection = Connection(websocket)
+        connection.start()
+        accepted = fill(connection, 5)
+        close_task = connection.close_task
+        await close_task
+        return connection, websocket, accepted, close_task
+
+    connection, websocket, accepted, close_task = asyncio.run(run())
+    # 전송 태스크가 아직 실행되지 않아 대기열 두 칸이 찬 뒤에는 닫기 태스크를 한 번만 만들고 더 받지 않음
+    assert accepted == [True, True, False, False, False]
+    assert close_task.done()
+    assert connection.closed
+    assert websocket.closed_with == 1013
+    assert connection.writer_task.cancelled()
+
+
+def test_writer_sends_queued_messages_in_order():
+    async def run():
+        websocket = FakeWebSocket()
+        websocket.blocked.set()
+        connection = Connection(websocket)
+        connection.start()
+        fill(connection, 3)
+        while len(websocket.frames) < 3:
+            await asyncio.sleep(0)
+        connection.stop()
+        return websocket
+
+    assert asyncio.run(run()).frames == ["알림 0", "알림 1", "알림 2"]
@@ -0,0 +1,33 @@
+import pytest
+
+from utils.ingredient_normalizer import normalize_ingredient_name, normalize_ingredient_names, normalize_ingredients
+
+
+@pytest.mark.parametrize("name, key", [
+    ("돼지고기 300g", "돼지고기"),
+    ("다진 마늘 1큰술", "마늘"),
+    ("다진마늘", "마늘"),
+    ("양파 반개", "양파"),
+    ("계란 2개", "달걀"),
+    ("진간장", "간장"),
+    ("간장 2T", "간장"),
+    ("설탕 1t", "설탕"),
+    ("소금 1/2tsp", "소금"),
+    ("밥 1공기", "밥"),
+    ("후추 약간", "후추"),
+    ("대파(흰 부분)", "파"),
+    ("Ｍｉｌｋ 200ml", "milk"),
+    ("", ""),
+    (None, ""),
+])
+def test_normalize_ingredient_name(name, key):
+    assert normalize_ingredient_name(name) == key
+
+
+def test_normalize_ingredient_names_dedupes_and_sorts():
+    assert normalize_ingredient_names(["계란 2개", "달걀", "양파", "약간"]) == ["달걀", "양파"]
+
+
+def test_normalize_ingredients_accepts_documents():
+    assert normalize_ingredients([{"name": "양파 1개"}, {"name": None}, {}]) == ["양파"]
+    assert normalize_ingredients(None) == []
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from utils.pagination_manager import decode_cursor, encode_cursor, keyset_query, next_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    cursor = encode_cursor(created_at, "abc_123")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, "abc_123")
+
+
+def test_decode_empty_cursor_is_first_page():
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "WzFd"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_keyset_query_without_cursor_keeps_query():
+    query = {"recipe_category": "korean"}
+    assert keyset_query(query, None, "recipe_id") is query
+
+
+def test_keyset_query_descending():
+    created_at = datetime(2024, 5, 1)
+    assert keyset_query({}, (created_at, "r1"), "recipe_id") == {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "recipe_id": {"$lt": "r1"}},
+        ]
+    }
+
+
+def test_keyset_query_ascending_with_filter():
+    created_at = datetime(2024, 5, 1)
+    query = keyset_query({"comment_parent": "r1"}, (created_at, "c1"), "comment_id", direction=1)
+    assert query == {
+        "$and": [
+            {"comment_parent": "r1"},
+            {"$or": [
+                {"created_at": {"$gt": created_at}},
+                {"created_at": created_at, "comment_id": {"$gt": "c1"}},
+            ]},
+        ]
+    }
+
+
+def test_next_cursor():
+    created_at = datetime(2024, 5, 1)
+    items = [{"created_at": created_at, "recipe_id": "r1"}, {"created_at": created_at, "recipe_id": "r2"}]
+    assert next_cursor(items, 3, "recipe_id") is None
+    assert decode_cursor(next_cursor(items, 2, "recipe_id")) == (created_at, "r2")
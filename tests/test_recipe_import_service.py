@@ -0,0 +1,139 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+
+import services.recipe_import_service as recipe_import_module
+from API.controllers import recipe_controller
+from services.recipe_import_service import iter_ndjson_batches
+from utils.session_manager import get_current_session
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def collect(stream, batch_size):
+    async def run():
+        return [batch async for batch in iter_ndjson_batches(stream, batch_size)]
+    return asyncio.run(run())
+
+
+def test_lines_split_across_chunks():
+    batches = collect(chunks(b'{"a": 1}\n{"b"', b': 2}\n{"c": 3}'), 10)
+    assert batches == [[(1, b'{"a": 1}'), (2, b'{"b": 2}'), (3, b'{"c": 3}')]]
+
+
+def test_batches_by_size_and_keeps_line_numbers():
+    batches = collect(chunks(b"1\n\n2\n3\n4\n"), 2)
+    assert batches == [[(1, b"1"), (3, b"2")], [(4, b"3"), (5, b"4")]]
+
+
+def test_empty_stream():
+    assert collect(chunks(), 2) == []
+    assert collect(chunks(b"\n \n"), 2) == []
+
+
+def recipe_line(index: int) -> bytes:
+    return json.dumps({
+        "recipe_title": f"레시피 {index}",
+        "recipe_thumbnail": "url",
+        "recipe_video": "url",
+        "recipe_description": "설명",
+        "recipe_category": "korean",
+        "recipe_info": {"serving": 1, "time": 10, "level": 1},
+        "recipe_ingredients": [{"name": "간장 2T", "amount": "2T"}],
+        "recipe_sequence": [{"step": 1, "picture": "url", "description": "굽는다"}],
+        "recipe_tip": "",
+    }, ensure_ascii=False).encode() + b"\n"
+
+
+@pytest.fixture
+def import_app(monkeypatch):
+    inserted = []
+
+    async def insert_recipe_batch(documents):
+        inserted.extend(documents)
+        return []
+
+    async def bump_version():
+        pass
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(recipe_controller.recipe_import_service.recipe_dao, "insert_recipe_batch", insert_recipe_batch)
+    monkeypatch.setattr(recipe_import_module, "get_validation_pool", lambda: pool)
+    monkeypatch.setattr(recipe_import_module.feed_cache, "bump_version", bump_version)
+    monkeypatch.setattr(recipe_import_module.search_engine, "add", lambda document: None)
+    app = FastAPI()
+    app.include_router(recipe_controller.router, prefix="/recipes")
+    app.dependency_overrides[get_current_session] = lambda: "admin"
+    yield app, inserted
+    pool.shutdown()
+
+
+async def post_chunks(app, path: str, chunks):
+    # 본문을 여러 http.request 메시지로 나눠 보내는 ASGI 클라이언트
+    # 본문을 다 보낸 뒤에는 응답이 끝날 때까지 기다렸다가 연결 종료를 알림
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+    finished = asyncio.Event()
+    sent = []
+
+    async def receive():
+        await asyncio.sleep(0)
+        if messages:
+            return messages.pop(0)
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            finished.set()
+
+    path, _, query_string = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query_string.encode(),
+        "headers": [(b"content-type", b"application/x-ndjson")], "client": ("test", 1), "server": ("test", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=10)
+    status = sent[0]["status"]
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return status, [json.loads(line) for line in body.splitlines()]
+
+
+def test_import_reads_every_chunk_of_the_body(import_app):
+    app, inserted = import_app
+    body = b"".join(recipe_line(index) for index in range(50))
+    # 줄 중간에서 잘린 작은 조각으로 전송
+    chunks = [body[offset:offset + 100] for offset in range(0, len(body), 100)]
+    status, progress = asyncio.run(post_chunks(app, "/recipes/import?batch_size=20", chunks))
+    assert status == 200
+    assert progress[-1] == {"done": True, "received": 50, "inserted": 50, "failed": 0}
+    assert [document["recipe_title"] for document in inserted] == [f"레시피 {index}" for index in range(50)]
+    assert all(document["recipe_ingredient_keys"] == ["간장"] for document in inserted)
+    assert all(isinstance(document["updated_at"], datetime) for document in inserted)
+
+
+def test_validate_batch_splits_across_workers_and_keeps_line_order(monkeypatch):
+    chunks = []
+    validate_recipe_lines = recipe_import_module.validate_recipe_lines
+
+    def validate(lines):
+        chunks.append([line_number for line_number, _ in lines])
+        return validate_recipe_lines(lines)
+
+    pool = ThreadPoolExecutor(max_workers=3)
+    monkeypatch.setattr(recipe_import_module, "get_validation_pool", lambda: pool)
+    monkeypatch.setattr(recipe_import_module, "validate_recipe_lines", validate)
+    lines = [(index + 1, recipe_line(index).strip() if index % 4 else b"{}") for index in range(10)]
+    documents, errors = asyncio.run(recipe_import_module.validate_batch(lines, workers=3))
+    pool.shutdown()
+    assert sorted(chunks) == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+    assert [line_number for line_number, _ in documents] == [2, 3, 4, 6, 7, 8, 10]
+    assert [error["line"] for error in errors] == [1, 5, 9]
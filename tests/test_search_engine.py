@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from models.recipe_models import Category
+from utils.search_engine import RecipeSearchEngine, tokenize
+
+
+class FakeCursor:
+    def __init__(self, documents, on_next=None):
+        self.documents = documents
+        self.on_next = on_next
+
+    def batch_size(self, size):
+        return self
+
+    def hint(self, index):
+        return self
+
+    async def __aiter__(self):
+        for document in self.documents:
+            await asyncio.sleep(0)
+            if self.on_next is not None:
+                self.on_next()
+            yield document
+
+
+class FakeCollection:
+    # build/refresh 가 보내는 세 가지 조회(전체, 변경분, 아이디 목록)만 흉내냄
+    def __init__(self, documents):
+        self.documents = documents
+        self.on_next = None
+
+    def find(self, query, projection):
+        if projection == {"_id": 0, "recipe_id": 1}:
+            return FakeCursor([{"recipe_id": document["recipe_id"]} for document in self.documents])
+        if query:
+            since = query["$or"][0]["created_at"]["$gt"]
+            documents = [
+                document for document in self.documents
+                if document["created_at"] > since or document.get("updated_at", datetime.min) > since
+            ]
+        else:
+            documents = list(self.documents)
+        return FakeCursor(documents, self.on_next)
+
+
+def recipe(recipe_id: str, title: str, created_at: datetime = datetime(2024, 1, 1), **fields) -> dict:
+    return {"recipe_id": recipe_id, "recipe_title": title, "created_at": created_at, **fields}
+
+
+def test_tokenize_uses_bigrams_and_unigrams_for_indexing():
+    assert tokenize("김치찌개") == ["김치", "치찌", "찌개"]
+    assert tokenize("파") == ["파"]
+    assert tokenize("김치", unigrams=True) == ["김", "치", "김치"]
+
+
+def test_search_ranks_title_matches_first():
+    engine = RecipeSearchEngine()
+    engine.add(recipe("r1", "된장국", recipe_description="김치를 곁들여 먹는다"))
+    engine.add(recipe("r2", "김치찌개"))
+    engine.add(recipe("r3", "계란말이"))
+    assert engine.search("김치") == ["r2", "r1"]
+    assert engine.search("김치", skip=1, limit=1) == ["r1"]
+    assert engine.search("없는검색어") == []
+
+
+def test_remove_drops_postings():
+    engine = RecipeSearchEngine()
+    engine.add(recipe("r1", "김치찌개"))
+    engine.add(recipe("r1", "된장찌개"))
+    assert engine.search("김치") == []
+    engine.remove("r1")
+    assert engine.search("찌개") == []
+    assert engine.postings == {}
+    assert engine.total_length == 0
+
+
+def test_category_enum_is_indexed_by_value():
+    engine = RecipeSearchEngine()
+    engine.add(recipe("r1", "비빔밥", recipe_category=Category.korean))
+    engine.add(recipe("r2", "덮밥", recipe_category="korean"))
+    assert sorted(engine.search("korean")) == ["r1", "r2"]
+    assert "go" not in engine.doc_terms["r1"]
+    assert engine.doc_terms["r1"]["ko"] == engine.doc_terms["r2"]["ko"]
+
+
+def test_build_replays_changes_made_during_the_build():
+    engine = RecipeSearchEngine()
+    collection = FakeCollection([recipe("r1", "김치찌개"), recipe("r2", "된장찌개")])
+    changes = [lambda: engine.add(recipe("r3", "김치볶음밥")), lambda: engine.remove("r2")]
+    collection.on_next = lambda: changes.pop(0)() if changes else None
+    asyncio.run(engine.build(collection))
+    assert engine.ready
+    assert sorted(engine.doc_terms) == ["r1", "r3"]
+    assert engine.changes is None
+
+
+def test_refresh_indexes_changes_and_drops_deleted_recipes():
+    engine = RecipeSearchEngine()
+    old = datetime.utcnow() - timedelta(days=1)
+    collection = FakeCollection([recipe("r1", "김치찌개", old), recipe("r2", "된장찌개", old)])
+    asyncio.run(engine.build(collection))
+    collection.documents = [
+        recipe("r1", "김치전", old, updated_at=datetime.utcnow()),
+        recipe("r3", "계란말이", datetime.utcnow()),
+    ]
+    asyncio.run(engine.refresh(collection))
+    assert sorted(engine.doc_terms) == ["r1", "r3"]
+    assert engine.search("김치전") == ["r1"]
+    assert engine.search("찌개") == []
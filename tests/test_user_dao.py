@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from dao.user_dao import UserDao, subscribe_operations, unsubscribe_operations
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class FakeUsersCollection:
+    # 첫 bulk_write 결과(수정된 문서 수)와 존재하는 사용자를 지정하고, 실행된 bulk_write 를 기록
+    def __init__(self, modified_count: int, existing_users):
+        self.modified_count = modified_count
+        self.existing_users = existing_users
+        self.bulk_writes = []
+
+    async def bulk_write(self, operations, ordered=True):
+        modified = self.modified_count if not self.bulk_writes else 0
+        self.bulk_writes.append(operations)
+        return SimpleNamespace(modified_count=modified)
+
+    def find(self, query, projection=None):
+        return FakeCursor([{"user_id": user_id} for user_id in self.existing_users])
+
+
+class FakeDbManager:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_collection(self, name):
+        return self.collection
+
+
+def modify(collection, subscribe: bool):
+    return asyncio.run(UserDao(FakeDbManager(collection)).modify_subscription("me", "other", subscribe))
+
+
+def test_subscribe_both_sides_updated():
+    collection = FakeUsersCollection(2, ["me", "other"])
+    modify(collection, True)
+    assert collection.bulk_writes == [subscribe_operations("me", "other")]
+
+
+def test_half_applied_subscribe_is_undone_with_unsubscribe():
+    collection = FakeUsersCollection(1, ["me"])
+    with pytest.raises(HTTPException) as exc_info:
+        modify(collection, True)
+    assert exc_info.value.status_code == 404
+    assert collection.bulk_writes == [subscribe_operations("me", "other"), unsubscribe_operations("me", "other")]
+
+
+def test_half_applied_unsubscribe_is_undone_with_subscribe():
+    collection = FakeUsersCollection(1, ["me"])
+    with pytest.raises(HTTPException) as exc_info:
+        modify(collection, False)
+    assert exc_info.value.status_code == 404
+    assert collection.bulk_writes == [unsubscribe_operations("me", "other"), subscribe_operations("me", "other")]
+
+
+def test_missing_user_without_changes_is_not_compensated():
+    collection = FakeUsersCollection(0, ["me"])
+    with pytest.raises(HTTPException) as exc_info:
+        modify(collection, True)
+    assert exc_info.value.status_code == 404
+    assert collection.bulk_writes == [subscribe_operations("me", "other")]
+
+
+@pytest.mark.parametrize("subscribe, detail", [(True, "이미 구독 중입니다"), (False, "구독을 취소할 수 없습니다.")])
+def test_no_change_between_existing_users_is_conflict(subscribe, detail):
+    collection = FakeUsersCollection(0, ["me", "other"])
+    with pytest.raises(HTTPException) as exc_info:
+        modify(collection, subscribe)
+    assert (exc_info.value.status_code, exc_info.value.detail) == (409, detail)
+
+
+def test_cannot_subscribe_to_self():
+    collection = FakeUsersCollection(0, ["me"])
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(UserDao(FakeDbManager(collection)).modify_subscription("me", "me", True))
+    assert exc_info.value.status_code == 400
+    assert collection.bulk_writes == []
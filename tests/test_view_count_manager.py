@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+import utils.view_count_manager as view_count_module
+from utils.view_count_manager import ViewCountManager
+
+
+class FakeRecipeDao:
+    def __init__(self, error: Exception = None, delay: float = 0):
+        self.error = error
+        self.delay = delay
+        self.writes = []
+
+    async def increment_recipe_views(self, counts):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        self.writes.append(dict(counts))
+        return len(counts)
+
+
+@pytest.fixture(autouse=True)
+def invalidated(monkeypatch):
+    keys = []
+
+    async def invalidate(*cache_keys):
+        keys.extend(cache_keys)
+
+    monkeypatch.setattr(view_count_module.recipe_cache, "invalidate", invalidate)
+    return keys
+
+
+def make_manager(*recipe_ids) -> ViewCountManager:
+    manager = ViewCountManager(flush_interval=60, max_pending=100)
+    for recipe_id in recipe_ids:
+        manager.increment(recipe_id)
+    return manager
+
+
+def test_flush_writes_pending_counts_and_invalidates_details(invalidated):
+    manager = make_manager("a", "a", "b")
+    dao = FakeRecipeDao()
+    assert asyncio.run(manager.flush(dao)) == 2
+    assert dao.writes == [{"a": 2, "b": 1}]
+    assert manager.pending == {}
+    assert invalidated == ["cache:recipe:a", "cache:recipe:b"]
+
+
+def test_partial_bulk_write_error_retries_only_failed_operations(invalidated):
+    manager = make_manager("a", "b", "b", "c")
+    error = BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "failed"}], "nModified": 2})
+    assert asyncio.run(manager.flush(FakeRecipeDao(error))) == 2
+    assert dict(manager.pending) == {"b": 2}
+    assert invalidated == ["cache:recipe:a", "cache:recipe:c"]
+
+
+def test_write_concern_error_does_not_retry():
+    manager = make_manager("a")
+    error = BulkWriteError({"writeErrors": [], "writeConcernErrors": [{"errmsg": "timeout"}], "nModified": 1})
+    asyncio.run(manager.flush(FakeRecipeDao(error)))
+    assert manager.pending == {}
+
+
+def test_failure_before_write_restores_all_counts(invalidated):
+    manager = make_manager("a", "b")
+    assert asyncio.run(manager.flush(FakeRecipeDao(ConnectionError("down")))) == 0
+    assert dict(manager.pending) == {"a": 1, "b": 1}
+    assert invalidated == []
+
+
+def test_cancelled_flush_restores_counts_and_keeps_new_views():
+    async def run():
+        manager = make_manager("a")
+        flush = asyncio.create_task(manager.flush(FakeRecipeDao(delay=10)))
+        await asyncio.sleep(0)
+        manager.increment("a")
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+        return manager
+
+    assert dict(asyncio.run(run()).pending) == {"a": 2}
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from datetime import datetime
+
+from utils.websocket_manager import UserNotification, WebSocketManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.01, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.frames = []
+        self.closed_with = None
+
+    async def send_text(self, data: str):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("closed")
+        self.frames.append(data)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+def notification(index: int) -> UserNotification:
+    return UserNotification(user_id="user", message=f"알림 {index}", timestamp=datetime(2024, 1, 1))
+
+
+def test_single_message_keeps_object_frame():
+    async def run():
+        manager = WebSocketManager()
+        sockets = [FakeWebSocket() for _ in range(3)]
+        manager.active_connections = set(sockets)
+        await manager.send_message(notification(0))
+        return sockets
+
+    for socket in asyncio.run(run()):
+        assert [json.loads(frame)["message"] for frame in socket.frames] == ["알림 0"]
+
+
+def test_burst_is_coalesced_into_one_batch_frame():
+    async def run():
+        manager = WebSocketManager()
+        socket = FakeWebSocket()
+        manager.active_connections = {socket}
+        await asyncio.gather(*(manager.send_message(notification(index)) for index in range(20)))
+        return manager, socket
+
+    manager, socket = asyncio.run(run())
+    assert len(socket.frames) == 1
+    batch = json.loads(socket.frames[0])
+    assert batch["type"] == "batch"
+    assert [message["message"] for message in batch["messages"]] == [f"알림 {index}" for index in range(20)]
+    assert manager.flush_task is None
+
+
+def test_messages_sent_during_a_broadcast_go_out_in_the_next_frame():
+    async def run():
+        manager = WebSocketManager()
+        socket = FakeWebSocket()
+        manager.active_connections = {socket}
+        first = asyncio.create_task(manager.send_message(notification(0)))
+        await asyncio.sleep(0.001)
+        await asyncio.gather(manager.send_message(notification(1)), manager.send_message(notification(2)))
+        await first
+        return socket
+
+    frames = [json.loads(frame) for frame in asyncio.run(run()).frames]
+    assert frames[0]["message"] == "알림 0"
+    assert [message["message"] for message in frames[1]["messages"]] == ["알림 1", "알림 2"]
+
+
+def test_slow_or_broken_sockets_are_dropped_and_closed():
+    async def run():
+        manager = WebSocketManager(send_timeout=0.05)
+        healthy = FakeWebSocket()
+        slow = FakeWebSocket(delay=1)
+        broken = FakeWebSocket(fail=True)
+        manager.active_connections = {healthy, slow, broken}
+        delivered = await manager.broadcast("frame")
+        return manager, delivered, healthy, slow, broken
+
+    manager, delivered, healthy, slow, broken = asyncio.run(run())
+    assert delivered == 1
+    assert manager.active_connections == {healthy}
+    assert slow.closed_with == 1011
+    assert broken.closed_with == 1011
@@ -0,0 +1,300 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from bson import json_util
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from utils.config import get_settings
+from utils.redis_manager import redis_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# datetime 을 naive(UTC) 로 복원해야 기존 응답 형식과 동일하게 직렬화됨
+JSON_OPTIONS = json_util.JSONOptions(json_mode=json_util.JSONMode.RELAXED, tz_aware=False)
+
+
+def dumps(value: Any) -> str:
+    return json_util.dumps(value, json_options=JSON_OPTIONS)
+
+
+def loads(value: str) -> Any:
+    return json_util.loads(value, json_options=JSON_OPTIONS)
+
+
+def _copy(value: Any) -> Any:
+    # 호출 측에서 최상위 키를 추가/수정해도 로컬 캐시 원본이 바뀌지 않도록 얕은 복사
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+class LocalTTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value: Any):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        self.entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class ReadThroughCache:
+    # Redis 를 공유 캐시로, 작은 프로세스 내 LRU 를 1차 캐시로 사용하는 read-through 캐시
+    # invalidation_channel 이 없으면 로컬 캐시는 다른 워커의 무효화를 받지 못하므로 TTL 을 짧게 유지
+    # 있으면 무효화한 키를 채널로 발행해 모든 워커의 로컬 캐시에서도 제거 (listen_invalidations 실행 필요)
+    def __init__(self, redis_client: Redis, ttl: int, local_size: int, local_ttl: float,
+                 invalidation_channel: Optional[str] = None):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.local = LocalTTLCache(local_size, local_ttl) if local_size > 0 else None
+        self.invalidation_channel = invalidation_channel
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not None:
+                return _copy(value)
+        value = await self._get_remote(key)
+        if value is None:
+            self.misses += 1
+            value = await loader()
+            if value is None:
+                return None
+            await self._set_remote(key, value)
+        else:
+            self.hits += 1
+        if self.local is not None:
+            self.local.set(key, value)
+        return _copy(value)
+
+    async def invalidate(self, *keys: str):
+        if self.local is not None:
+            for key in keys:
+                self.local.delete(key)
+        try:
+            if self.invalidation_channel is None:
+                await self.redis_client.delete(*keys)
+                return
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                await pipe.delete(*keys).publish(self.invalidation_channel, json.dumps(keys)).execute()
+        except RedisError as e:
+            self.errors += 1
+            logger.error(f"Failed to invalidate cache {keys}: {str(e)}")
+
+    async def listen_invalidations(self):
+        # 다른 워커에서 무효화한 키를 로컬 캐시에서 제거. lifespan 에서 백그라운드로 실행
+        if self.local is None or self.invalidation_channel is None:
+            return
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self.invalidation_channel)
+            while True:
+                try:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                except RedisError as e:
+                    # 연결이 끊긴 동안 놓친 무효화는 로컬 캐시 TTL 이 지나면 반영됨
+                    logger.error(f"Failed to read cache invalidations: {str(e)}")
+                    await asyncio.sleep(1)
+                    continue
+                if message is None:
+                    continue
+                try:
+                    keys = json.loads(message["data"])
+                except ValueError:
+                    logger.error(f"Invalid cache invalidation payload: {message['data']}")
+                    continue
+                for key in keys:
+                    self.local.delete(key)
+        finally:
+            await pubsub.close()
+
+    async def _get_remote(self, key: str) -> Optional[Any]:
+        try:
+            cached = await self.redis_client.get(key)
+        except RedisError as e:
+            self.errors += 1
+            logger.error(f"Failed to read cache {key}: {str(e)}")
+            return None
+        return None if cached is None else loads(cached)
+
+    async def _set_remote(self, key: str, value: Any):
+        try:
+            await self.redis_client.set(key, dumps(value), ex=self.ttl)
+        except RedisError as e:
+            self.errors += 1
+            logger.error(f"Failed to write cache {key}: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "redis": {"hits": self.hits, "misses": self.misses, "errors": self.errors},
+            "local": self.local.stats() if self.local is not None else None,
+        }
+
+
+class FeedCache:
+    # 피드 페이지 캐시. 레시피가 작성/수정/삭제되면 버전을 올려 모든 페이지를 한 번에 무효화
+    # 같은 페이지가 동시에 만료되면 한 요청만 DB 를 조회하고 나머지는 그 결과를 기다림
+    VERSION_KEY = "cache:feed:version"
+
+    def __init__(self, redis_client: Redis, ttl: int, version_ttl: float):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.version_ttl = version_ttl
+        self.version: Optional[str] = None
+        self.version_expires_at = 0.0
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def get_or_load(self, feed: str, params: tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        key = await self._key(feed, params)
+        future = self.inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # 캐시를 채우던 요청이 취소된 경우 대기하던 요청이 다시 시도
+                return await self.get_or_load(feed, params, loader)
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            value = await self._fill(key, loader)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기 중인 요청이 없으면 "exception was never retrieved" 경고가 남지 않도록 소비
+            future.exception()
+            raise
+        finally:
+            self.inflight.pop(key, None)
+
+    async def bump_version(self):
+        try:
+            self.version = str(await self.redis_client.incr(self.VERSION_KEY))
+            self.version_expires_at = time.monotonic() + self.version_ttl
+        except RedisError as e:
+            self.errors += 1
+            logger.error(f"Failed to bump feed cache version: {str(e)}")
+
+    async def _fill(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            cached = await self.redis_client.get(key)
+        except RedisError as e:
+            self.errors += 1
+            logger.error(f"Failed to read feed cache {key}: {str(e)}")
+            cached = None
+        if cached is not None:
+            self.hits += 1
+            return loads(cached)
+        self.misses += 1
+        value = await loader()
+        try:
+            await self.redis_client.set(key, dumps(value), ex=self.ttl)
+        except RedisError as e:
+            self.errors += 1
+            logger.error(f"Failed to write feed cache {key}: {str(e)}")
+        return value
+
+    async def _key(self, feed: str, params: tuple) -> str:
+        # 버전은 매 요청마다 Redis 에서 읽지 않고 짧게 로컬에 보관
+        if self.version is None or self.version_expires_at < time.monotonic():
+            try:
+                self.version = await self.redis_client.get(self.VERSION_KEY) or "0"
+            except RedisError as e:
+                self.errors += 1
+                logger.error(f"Failed to read feed cache version: {str(e)}")
+                self.version = self.version or "0"
+            self.version_expires_at = time.monotonic() + self.version_ttl
+        return f"cache:feed:{self.version}:{feed}:" + ":".join(str(param) for param in params)
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "inflight": len(self.inflight),
+        }
+
+
+def recipe_key(recipe_id: str) -> str:
+    return f"cache:recipe:{recipe_id}"
+
+
+def comments_key(recipe_id: str) -> str:
+    return f"cache:comments:{recipe_id}"
+
+
+def author_key(user_id: str) -> str:
+    return f"cache:author:{user_id}"
+
+
+recipe_cache = ReadThroughCache(
+    redis_client,
+    ttl=settings.recipe_cache_ttl_seconds,
+    local_size=settings.recipe_cache_local_size,
+    local_ttl=settings.recipe_cache_local_ttl_seconds
+)
+author_cache = ReadThroughCache(
+    redis_client,
+    ttl=settings.author_cache_ttl_seconds,
+    local_size=settings.author_cache_local_size,
+    local_ttl=settings.author_cache_local_ttl_seconds,
+    # 로컬 TTL 이 길어 닉네임/프로필 변경을 모든 워커에 바로 알림
+    invalidation_channel="cache:author:invalidate"
+)
+feed_cache = FeedCache(
+    redis_client,
+    ttl=settings.feed_cache_ttl_seconds,
+    version_ttl=settings.feed_cache_version_ttl_seconds
+)
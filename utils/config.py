@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseSettings
 
 
@@ -9,6 +11,48 @@ class Settings(BaseSettings):
     smtp_port: int
     sender_email: str
     smtp_password: str
+    redis_max_connections: int = 100
+    redis_pool_timeout_seconds: float = 5.0
+    redis_socket_timeout_seconds: float = 10.0
+    redis_health_check_interval_seconds: int = 30
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_concurrency: int = 16
+    session_cache_size: int = 10000
+    session_cache_ttl_seconds: float = 5.0
+    presence_ttl_seconds: int = 60
+    notification_inbox_maxlen: int = 200
+    websocket_send_queue_size: int = 100
+    websocket_send_timeout_seconds: float = 10.0
+    # 전송 대기열이 가득 찬 느린 클라이언트 처리 방식: "drop"(새 알림 버림) 또는 "disconnect"(연결 종료)
+    websocket_slow_consumer_policy: str = "drop"
+    notification_inbox_ttl_seconds: int = 2592000
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: int = 300000
+    mongo_wait_queue_timeout_ms: int = 5000
+    mongo_server_selection_timeout_ms: int = 5000
+    mongo_connect_timeout_ms: int = 5000
+    mongo_socket_timeout_ms: Optional[int] = None
+    mongo_compressors: str = "zlib"
+    search_index_refresh_seconds: int = 600
+    view_flush_interval_seconds: float = 5.0
+    view_flush_max_pending: int = 5000
+    recipe_cache_ttl_seconds: int = 300
+    recipe_cache_local_size: int = 1000
+    recipe_cache_local_ttl_seconds: float = 5.0
+    feed_cache_ttl_seconds: int = 30
+    feed_cache_version_ttl_seconds: float = 1.0
+    import_batch_size: int = 1000
+    import_validation_workers: int = 2
+    import_spool_max_memory_bytes: int = 16777216
+    detail_comment_limit: int = 20
+    author_cache_ttl_seconds: int = 3600
+    author_cache_local_size: int = 5000
+    author_cache_local_ttl_seconds: float = 60.0
+    profile_sync_batch_size: int = 500
+    profile_sync_batch_delay_seconds: float = 0.2
+    profile_sync_max_attempts: int = 5
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import WebSocket, status
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from utils.config import get_settings
+from utils.redis_manager import redis_client as shared_redis_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# 워커(프로세스)마다 고유한 아이디. 알림은 이 아이디의 채널로만 전달됨
+NODE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def presence_key(user_id: str) -> str:
+    return f"presence:{user_id}"
+
+
+def node_channel(node_id: str) -> str:
+    return f"notifications:node:{node_id}"
+
+
+async def get_user_nodes(redis_client: Redis, user_id: str) -> List[str]:
+    # 사용자가 연결된 워커 목록. score 는 각 워커의 만료 시각이라 비정상 종료된 워커는 자동으로 제외됨
+    return await redis_client.zrangebyscore(presence_key(user_id), time.time(), "+inf")
+
+
+def parse_stream_id(stream_id: str) -> Tuple[int, int]:
+    # Redis Stream 아이디("밀리초-순번")를 비교 가능한 튜플로 변환
+    parts = stream_id.split("-")
+    if len(parts) > 2:
+        raise ValueError(f"Invalid stream id: {stream_id}")
+    return int(parts[0]), int(parts[1]) if len(parts) == 2 else 0
+
+
+class Connection:
+    # 소켓마다 크기가 제한된 전송 대기열과 전송 태스크를 두어 느린 클라이언트가 다른 사용자 전달을 막지 않도록 함
+    # json_frames 인 연결은 알림 아이디를 포함한 JSON 으로 받고, 재접속 시 last_id 이후 알림을 먼저 다시 받음
+    # 기존 클라이언트는 지금처럼 메시지 문자열만 받음
+    def __init__(
+        self,
+        websocket: WebSocket,
+        last_id: Optional[str] = None,
+        replay_loader: Callable[[str], Awaitable[List[dict]]] = None,
+    ):
+        self.websocket = websocket
+        self.json_frames = last_id is not None
+        self.last_id = last_id
+        self.replay_loader = replay_loader
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.websocket_send_queue_size)
+        self.dropped = 0
+        self.closed = False
+        self.writer_task: Optional[asyncio.Task] = None
+        self.close_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self.writer_task = asyncio.create_task(self._writer())
+
+    def enqueue(self, notification: dict) -> bool:
+        # 구독 태스크는 대기열에 넣기만 하고 전송을 기다리지 않음
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(notification)
+            return True
+        except asyncio.QueueFull:
+            pass
+        if settings.websocket_slow_consumer_policy == "disconnect":
+            # 이벤트 루프는 태스크를 약하게 참조하므로 완료 전에 사라지지 않도록 연결에 보관
+            if self.close_task is None:
+                self.close_task = asyncio.create_task(self.close(status.WS_1013_TRY_AGAIN_LATER))
+        else:
+            # json_frames 클라이언트는 재접속하거나 알림함 API 로 버려진 알림을 다시 받을 수 있음
+            self.dropped += 1
+        return False
+
+    async def _writer(self):
+        try:
+            if self.replay_loader is not None:
+                for notification in await self.replay_loader(self.last_id):
+                    await self._send(notification)
+            while True:
+                await self._send(await self.queue.get())
+        except Exception as e:
+            logger.error(f"Failed to send notification: {str(e)}")
+            await self.close(status.WS_1011_INTERNAL_ERROR)
+
+    async def _send(self, notification: dict):
+        if self.json_frames:
+            notification_id = notification.get("id")
+            # 재전송한 알림이 실시간으로 한 번 더 오면 건너뜀
+            if notification_id and self.last_id and \
+                    parse_stream_id(notification_id) <= parse_stream_id(self.last_id):
+                return
+            frame = json.dumps(notification, default=str)
+            self.last_id = notification_id or self.last_id
+        else:
+            frame = notification["message"]
+        await asyncio.wait_for(self.websocket.send_text(frame), timeout=settings.websocket_send_timeout_seconds)
+
+    async def close(self, code: int):
+        # 소켓이 닫히면 엔드포인트의 receive 가 끝나면서 레지스트리에서 제거됨
+        if self.closed:
+            return
+        self.closed = True
+        if self.writer_task is not None and self.writer_task is not asyncio.current_task():
+            self.writer_task.cancel()
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+    def stop(self):
+        self.closed = True
+        if self.writer_task is not None:
+            self.writer_task.cancel()
+
+
+class ConnectionRegistry:
+    # 이 워커에 연결된 웹소켓을 사용자 아이디별 집합으로 관리 (여러 탭/기기 동시 접속 지원)
+    # Redis presence(사용자 → 워커)에 자신을 등록하고, 자신의 채널 하나만 구독해 대상 사용자의 소켓으로 전달
+    def __init__(self, redis_client: Redis = None, node_id: str = NODE_ID, presence_ttl: int = None):
+        self.redis_client = redis_client or shared_redis_client
+        self.node_id = node_id
+        self.presence_ttl = presence_ttl or settings.presence_ttl_seconds
+        self.connections: Dict[str, Set[Connection]] = {}
+
+    async def register(
+        self,
+        user_id: str,
+        websocket: WebSocket,
+        last_id: Optional[str] = None,
+        replay_loader: Callable[[str], Awaitable[List[dict]]] = None,
+    ) -> Connection:
+        connection = Connection(websocket, last_id, replay_loader)
+        self.connections.setdefault(user_id, set()).add(connection)
+        # presence 를 먼저 기록해야 재전송 조회 이후 추가된 알림도 이 워커로 발행됨 (겹치는 알림은 last_id 로 걸러짐)
+        await self._announce([user_id])
+        connection.start()
+        return connection
+
+    async def unregister(self, user_id: str, connection: Connection):
+        connection.stop()
+        connections = self.connections.get(user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        if connections:
+            return
+        # 이 워커에 남은 소켓이 없을 때만 presence 에서 제거
+        del self.connections[user_id]
+        try:
+            await self.redis_client.zrem(presence_key(user_id), self.node_id)
+        except RedisError as e:
+            logger.error(f"Failed to remove presence of {user_id}: {str(e)}")
+
+    async def _announce(self, user_ids: List[str]):
+        expires_at = time.time() + self.presence_ttl
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    key = presence_key(user_id)
+                    pipe.zadd(key, {self.node_id: expires_at})
+                    pipe.zremrangebyscore(key, "-inf", time.time())
+                    pipe.expire(key, self.presence_ttl)
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Failed to update presence: {str(e)}")
+
+    async def dispatch(self, notification: dict):
+        frame = {
+            "id": notification.get("id"),
+            "message": notification["message"],
+            "created_at": notification.get("created_at"),
+        }
+        for connection in list(self.connections.get(notification["user_id"], ())):
+            connection.enqueue(frame)
+
+    async def listen(self):
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(node_channel(self.node_id))
+            while True:
+                try:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                except RedisError as e:
+                    logger.error(f"Failed to read notifications: {str(e)}")
+                    await asyncio.sleep(1)
+                    continue
+                if message is None:
+                    continue
+                try:
+                    notification = json.loads(message["data"])
+                except ValueError:
+                    logger.error(f"Invalid notification payload: {message['data']}")
+                    continue
+                await self.dispatch(notification)
+        finally:
+            await pubsub.close()
+
+    def stats(self) -> dict:
+        connections = [connection for user in self.connections.values() for connection in user]
+        return {
+            "node_id": self.node_id,
+            "users": len(self.connections),
+            "connections": len(connections),
+            "queued": sum(connection.queue.qsize() for connection in connections),
+            "dropped": sum(connection.dropped for connection in connections),
+        }
+
+    async def heartbeat(self):
+        # 연결이 유지되는 동안 presence 만료 시각을 갱신
+        while True:
+            await asyncio.sleep(self.presence_ttl / 3)
+            if self.connections:
+                await self._announce(list(self.connections))
+
+    async def run(self):
+        # lifespan 에서 실행되는 워커당 하나의 구독/heartbeat 태스크
+        await asyncio.gather(self.listen(), self.heartbeat())
+
+    async def clear_presence(self):
+        # 종료 시 이 워커로 라우팅되지 않도록 presence 에서 제거
+        if not self.connections:
+            return
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for user_id in self.connections:
+                    pipe.zrem(presence_key(user_id), self.node_id)
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Failed to clear presence: {str(e)}")
+
+
+connection_registry = ConnectionRegistry()
@@ -1,13 +1,120 @@
+import threading
+from collections import defaultdict
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 from utils.config import get_settings
 
 settings = get_settings()
 
 
-class MongoDBManager:
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    # 드라이버의 커넥션 풀 이벤트로 서버별 사용량을 집계 (이벤트는 드라이버 스레드에서도 호출됨)
     def __init__(self):
-        self.client = AsyncIOMotorClient(settings.mongo_db_url)
-        self.database = self.client.get_database(settings.mongo_db_name)
+        self.lock = threading.Lock()
+        self.servers = defaultdict(lambda: {
+            "open": 0,
+            "checked_out": 0,
+            "max_checked_out": 0,
+            "waiting": 0,
+            "checkout_failed": 0,
+            "cleared": 0,
+        })
+
+    def _update(self, event, **changes):
+        with self.lock:
+            server = self.servers[f"{event.address[0]}:{event.address[1]}"]
+            for field, amount in changes.items():
+                server[field] += amount
+            server["max_checked_out"] = max(server["max_checked_out"], server["checked_out"])
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event, cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(event, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event, open=-1)
+
+    def connection_check_out_started(self, event):
+        self._update(event, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._update(event, waiting=-1, checkout_failed=1)
+
+    def connection_checked_out(self, event):
+        self._update(event, waiting=-1, checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._update(event, checked_out=-1)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                address: {
+                    **server,
+                    "utilization": round(server["checked_out"] / settings.mongo_max_pool_size, 3)
+                    if settings.mongo_max_pool_size else None,
+                }
+                for address, server in self.servers.items()
+            }
+
+
+class MongoDBManager:
+    # 프로세스 전체에서 하나의 AsyncIOMotorClient(커넥션 풀)를 공유
+    # 앱에서는 lifespan 에서 connect/close 하고, CLI 등에서는 처음 사용할 때 연결
+    client: AsyncIOMotorClient = None
+    pool_listener = PoolStatsListener()
+
+    @classmethod
+    def connect(cls) -> AsyncIOMotorClient:
+        if cls.client is None:
+            options = {
+                "maxPoolSize": settings.mongo_max_pool_size,
+                "minPoolSize": settings.mongo_min_pool_size,
+                "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+                "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+                "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+                "connectTimeoutMS": settings.mongo_connect_timeout_ms,
+                "socketTimeoutMS": settings.mongo_socket_timeout_ms,
+                "event_listeners": [cls.pool_listener],
+            }
+            if settings.mongo_compressors:
+                options["compressors"] = settings.mongo_compressors
+            cls.client = AsyncIOMotorClient(settings.mongo_db_url, **options)
+        return cls.client
+
+    @classmethod
+    def close(cls):
+        if cls.client is not None:
+            cls.client.close()
+            cls.client = None
+
+    @property
+    def database(self):
+        return self.connect().get_database(settings.mongo_db_name)
 
     def get_collection(self, collection_name: str):
         return self.database.get_collection(collection_name)
+
+    def pool_stats(self) -> dict:
+        return {
+            "max_pool_size": settings.mongo_max_pool_size,
+            "servers": self.pool_listener.stats(),
+        }
+
+
+db_manager = MongoDBManager()
@@ -1,22 +1,57 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
+from .config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class Hasher:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    # 설정한 비용(rounds)과 다른 해시는 needs_update 로 판정되어 로그인 시 다시 해시됨
+    pwd_context = CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.bcrypt_rounds,
+        bcrypt__min_rounds=settings.bcrypt_rounds,
+        bcrypt__max_rounds=settings.bcrypt_rounds,
+    )
+    # bcrypt 는 GIL 을 풀고 계산하므로 전용 스레드 풀에서 실행하면 이벤트 루프가 멈추지 않음
+    executor = ThreadPoolExecutor(
+        max_workers=settings.password_hash_workers, thread_name_prefix="password-hash"
+    )
+    semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    async def _run(cls, func, *args):
+        # 로그인이 몰려도 대기열이 무한히 쌓이지 않도록 동시에 처리할 요청 수를 제한
+        if cls.semaphore is None:
+            cls.semaphore = asyncio.Semaphore(settings.password_hash_max_concurrency)
+        async with cls.semaphore:
+            return await asyncio.get_running_loop().run_in_executor(cls.executor, func, *args)
 
     @classmethod
     async def get_hashed_password(cls, password: str):
-        return cls.pwd_context.hash(password)
+        return await cls._run(cls.pwd_context.hash, password)
 
     @classmethod
-    def verify_password(cls, plain_password: str, hashed_password: str):
+    async def verify_password(cls, plain_password: str, hashed_password: str):
+        is_valid, _ = await cls.verify_and_update(plain_password, hashed_password)
+        return is_valid
+
+    @classmethod
+    async def verify_and_update(
+        cls, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        # 비밀번호가 맞고 해시 비용이 바뀐 경우 새 해시를 함께 반환
         if not plain_password or not hashed_password:
-            return False
+            return False, None
 
-        is_valid = False
         try:
-            is_valid = cls.pwd_context.verify(plain_password, hashed_password)
+            return await cls._run(cls.pwd_context.verify_and_update, plain_password, hashed_password)
         except Exception as e:
-            print(f"Error verifying password: {e}")
-
-        return is_valid
+            logger.error(f"Error verifying password: {str(e)}")
+            return False, None
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from dao.recipe_dao import ingredient_query
+from utils.db_manager import db_manager
+from utils.pagination_manager import keyset_query
+from utils.search_engine import changed_since_query
+
+logger = logging.getLogger(__name__)
+
+KEYSET_SORT = [("created_at", DESCENDING), ("recipe_id", DESCENDING)]
+
+# 컬렉션별로 필요한 인덱스. 이름을 지정하지 않아 기존에 같은 키로 만든 인덱스와 충돌하지 않음
+INDEXES: Dict[str, List[IndexModel]] = {
+    "recipes": [
+        IndexModel([("recipe_id", ASCENDING)], unique=True),
+        IndexModel(KEYSET_SORT),
+        # 키셋 페이지네이션용 (필터 필드, created_at, recipe_id) 인덱스
+        IndexModel([("recipe_category", ASCENDING), *KEYSET_SORT]),
+        IndexModel([("user_id", ASCENDING), *KEYSET_SORT]),
+        IndexModel([("recipe_info.serving", ASCENDING), *KEYSET_SORT]),
+        IndexModel([("recipe_like_count", DESCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("recipe_ingredient_keys", ASCENDING), ("created_at", DESCENDING)]),
+        # 검색 인덱스 증분 갱신용 수정 시각 인덱스
+        IndexModel([("updated_at", ASCENDING)]),
+    ],
+    "users": [
+        IndexModel([("user_id", ASCENDING)], unique=True),
+        IndexModel([("email", ASCENDING)], unique=True),
+    ],
+    "comments": [
+        IndexModel([("comment_id", ASCENDING)], unique=True),
+        IndexModel([("comment_parent", ASCENDING), ("created_at", ASCENDING), ("comment_id", ASCENDING)]),
+        IndexModel([("comment_author", ASCENDING)]),
+    ],
+}
+
+# DAO 가 실행하는 조회 형태. check 명령이 explain 으로 실행 계획을 확인
+# 정규식 검색(search_recipes_by_regex)은 검색 인덱스가 준비되기 전 대체 경로라 제외
+# 커서/재료 조건은 DAO 와 같은 함수로 만들어 실제 조회와 형태가 어긋나지 않도록 함
+RECIPE_AFTER = (datetime(2024, 1, 1), "recipe")
+COMMENT_AFTER = (datetime(2024, 1, 1), "comment")
+
+QUERY_SHAPES = [
+    ("recipes", {"recipe_id": "recipe"}, None),
+    ("recipes", {"recipe_id": {"$in": ["recipe"]}}, None),
+    ("recipes", {}, KEYSET_SORT),
+    ("recipes", {"recipe_category": "category"}, KEYSET_SORT),
+    ("recipes", keyset_query({}, RECIPE_AFTER, "recipe_id"), KEYSET_SORT),
+    ("recipes", keyset_query({"recipe_category": "category"}, RECIPE_AFTER, "recipe_id"), KEYSET_SORT),
+    ("recipes", {"user_id": "user"}, KEYSET_SORT),
+    ("recipes", {"recipe_info.serving": 1}, KEYSET_SORT),
+    ("recipes", {}, [("recipe_like_count", DESCENDING), ("created_at", DESCENDING)]),
+    ("recipes", ingredient_query(["ingredient"]), None),
+    ("recipes", ingredient_query(["ingredient", "other"], match_all=True, excluded_keys=["excluded"]), None),
+    ("recipes", {"user_id": "user", "user_nickname": {"$ne": "nickname"}}, None),
+    ("recipes", changed_since_query(RECIPE_AFTER[0]), None),
+    ("users", {"user_id": "user"}, None),
+    ("users", {"user_id": {"$in": ["user"]}}, None),
+    ("users", {"email": "user@example.com"}, None),
+    ("users", {"user_id": "user", "subscriptions": "user"}, None),
+    ("comments", {"comment_id": "comment"}, None),
+    ("comments", {"comment_parent": "recipe"}, [("created_at", ASCENDING), ("comment_id", ASCENDING)]),
+    (
+        "comments",
+        keyset_query({"comment_parent": "recipe"}, COMMENT_AFTER, "comment_id", direction=1),
+        [("created_at", ASCENDING), ("comment_id", ASCENDING)]
+    ),
+    ("comments", {"comment_author": "user"}, None),
+]
+
+
+async def ensure_indexes(database):
+    # create_indexes 는 이미 같은 인덱스가 있으면 아무것도 하지 않으므로 기동 시마다 호출해도 안전
+    for collection_name, indexes in INDEXES.items():
+        collection = database.get_collection(collection_name)
+        for index in indexes:
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                # 중복 데이터 등으로 고유 인덱스를 만들 수 없어도 서버 기동은 계속
+                logger.error(f"Failed to create index {index.document['name']} on {collection_name}: {str(e)}")
+
+
+def _plan_stages(plan: dict):
+    yield plan.get("stage")
+    for child in [plan.get("inputStage"), plan.get("queryPlan"), *plan.get("inputStages", [])]:
+        if child:
+            yield from _plan_stages(child)
+
+
+async def find_collection_scans(database) -> List[str]:
+    failures = []
+    for collection_name, query, sort in QUERY_SHAPES:
+        command = {"find": collection_name, "filter": query, "limit": 20}
+        if sort:
+            command["sort"] = dict(sort)
+        result = await database.command({"explain": command, "verbosity": "queryPlanner"})
+        stages = set(_plan_stages(result["queryPlanner"]["winningPlan"]))
+        if "COLLSCAN" in stages:
+            failures.append(f"{collection_name} {query} sort={sort}")
+    return failures
+
+
+async def main(command: str):
+    try:
+        await ensure_indexes(db_manager.database)
+        if command == "check":
+            failures = await find_collection_scans(db_manager.database)
+            for failure in failures:
+                print(f"COLLSCAN: {failure}")
+            if failures:
+                return 1
+            print(f"{len(QUERY_SHAPES)}개 조회 모두 인덱스를 사용합니다.")
+        return 0
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    # python -m utils.index_manager [apply|check]
+    command = sys.argv[1] if len(sys.argv) > 1 else "apply"
+    if command not in ("apply", "check"):
+        print("usage: python -m utils.index_manager [apply|check]")
+        sys.exit(2)
+    sys.exit(asyncio.run(main(command)))
@@ -0,0 +1,69 @@
+import re
+import unicodedata
+from typing import Iterable, List
+
+# 같은 재료를 가리키는 표기를 하나의 키로 통일
+INGREDIENT_SYNONYMS = {
+    "계란": "달걀",
+    "달걀노른자": "달걀",
+    "달걀흰자": "달걀",
+    "진간장": "간장",
+    "양조간장": "간장",
+    "국간장": "간장",
+    "다진마늘": "마늘",
+    "통마늘": "마늘",
+    "다진파": "파",
+    "대파": "파",
+    "쪽파": "파",
+    "실파": "파",
+    "청양고추": "고추",
+    "풋고추": "고추",
+    "홍고추": "고추",
+    "배추김치": "김치",
+    "묵은지": "김치",
+    "순두부": "두부",
+    "연두부": "두부",
+    "부침두부": "두부",
+    "백설탕": "설탕",
+    "황설탕": "설탕",
+    "포도씨유": "식용유",
+    "카놀라유": "식용유",
+    "삼겹살": "돼지고기",
+    "쇠고기": "소고기",
+}
+
+BRACKET_PATTERN = re.compile(r"\(.*?\)|\[.*?\]")
+AMOUNT_PATTERN = re.compile(
+    r"\d+(?:[./]\d+)?\s*"
+    # 소문자로 바꾼 뒤 적용하므로 "2T"(큰술)/"1t"(작은술)는 t 로 처리. t 는 tbsp/tsp 뒤에 두어 긴 단위를 먼저 매칭
+    r"(?:kg|g|ml|l|개|큰술|작은술|숟가락|스푼|컵|tbsp|tsp|t|장|줌|쪽|모|마리|대|알|봉지|봉|캔|꼬집|뿌리|송이|통|공기)?"
+)
+VAGUE_AMOUNT_PATTERN = re.compile(r"약간|적당량|조금|소량|한줌|반개")
+SEPARATOR_PATTERN = re.compile(r"[\s\-_/,.·~]+")
+
+
+def normalize_ingredient_name(name: str) -> str:
+    key = unicodedata.normalize("NFKC", name or "").lower()
+    key = BRACKET_PATTERN.sub(" ", key)
+    key = AMOUNT_PATTERN.sub(" ", key)
+    key = VAGUE_AMOUNT_PATTERN.sub(" ", key)
+    # "다진 마늘" / "다진마늘" 처럼 띄어쓰기만 다른 표기를 같은 키로 취급
+    key = SEPARATOR_PATTERN.sub("", key)
+    return INGREDIENT_SYNONYMS.get(key, key)
+
+
+def normalize_ingredient_names(names: Iterable[str]) -> List[str]:
+    keys = {normalize_ingredient_name(name) for name in names}
+    keys.discard("")
+    return sorted(keys)
+
+
+def normalize_ingredients(ingredients) -> List[str]:
+    # Ingredients 모델 리스트와 Mongo 문서(dict) 리스트 모두 처리
+    names = []
+    for ingredient in ingredients or []:
+        if isinstance(ingredient, dict):
+            names.append(ingredient.get("name") or "")
+        else:
+            names.append(ingredient.name)
+    return normalize_ingredient_names(names)
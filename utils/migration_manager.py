@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import sys
+from datetime import datetime
+
+from dao.recipe_dao import RecipeDao
+from dao.user_dao import UserDao
+from utils.db_manager import db_manager
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_COLLECTION = "migrations"
+
+# 한 번만 실행하면 되는 데이터 보정 작업. 인덱스가 없는 필드의 $exists 조회라 전체 컬렉션을 읽으므로
+# 앱 기동 시가 아니라 배포할 때 명령으로 실행하고, 완료 기록을 남겨 다시 실행되지 않도록 함
+MIGRATIONS = [
+    ("recipe_like_count", lambda: RecipeDao(db_manager).backfill_recipe_like_count()),
+    ("comment_count", lambda: RecipeDao(db_manager).backfill_comment_count()),
+    ("follow_counts", lambda: UserDao(db_manager).backfill_follow_counts()),
+    ("recipe_ingredient_keys", lambda: RecipeDao(db_manager).backfill_ingredient_keys()),
+]
+
+
+async def applied_migrations(database) -> set:
+    cursor = database.get_collection(MIGRATION_COLLECTION).find({}, {"_id": 1})
+    return {migration["_id"] async for migration in cursor}
+
+
+async def run_migrations(database, force: bool = False):
+    applied = set() if force else await applied_migrations(database)
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        modified = await migrate()
+        await database.get_collection(MIGRATION_COLLECTION).update_one(
+            {"_id": name},
+            {"$set": {"applied_at": datetime.utcnow(), "modified": modified}},
+            upsert=True
+        )
+        print(f"{name}: {modified}개 문서 보정")
+
+
+async def main(command: str):
+    try:
+        if command == "status":
+            applied = await applied_migrations(db_manager.database)
+            for name, _ in MIGRATIONS:
+                print(f"{'applied' if name in applied else 'pending':>8}  {name}")
+        else:
+            await run_migrations(db_manager.database, force=command == "force")
+        return 0
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    # python -m utils.migration_manager [run|status|force]
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    if command not in ("run", "status", "force"):
+        print("usage: python -m utils.migration_manager [run|status|force]")
+        sys.exit(2)
+    sys.exit(asyncio.run(main(command)))
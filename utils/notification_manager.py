@@ -1,23 +1,174 @@
-import redis
 import json
 import logging
+from datetime import datetime
+from typing import List, Optional
+from fastapi import HTTPException
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from .config import get_settings
+from .connection_registry import get_user_nodes, node_channel, parse_stream_id
+from .redis_manager import redis_client as shared_redis_client
 
 settings = get_settings()
 
-# Redis pub/sub 설정
-redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-pubsub = redis_client.pubsub()
-pubsub.subscribe("notifications")
+
+def inbox_key(user_id: str) -> str:
+    return f"inbox:{user_id}"
+
+
+def inbox_read_key(user_id: str) -> str:
+    return f"inbox:{user_id}:read"
+
+
+def inbox_unread_key(user_id: str) -> str:
+    return f"inbox:{user_id}:unread"
+
+
+# 스트림 아이디 비교와 읽지 않은 알림 수 재계산은 여러 스크립트에서 함께 사용
+LUA_HELPERS = """
+local function parse_id(stream_id)
+    local ms, seq = string.match(stream_id, "^(%d+)-?(%d*)$")
+    return tonumber(ms), tonumber(seq) or 0
+end
+
+local function id_greater(a, b)
+    local a_ms, a_seq = parse_id(a)
+    local b_ms, b_seq = parse_id(b)
+    return a_ms > b_ms or (a_ms == b_ms and a_seq > b_seq)
+end
+
+local function recount(inbox, read, unread, ttl)
+    local last_read = redis.call("GET", read) or "0"
+    local count = #redis.call("XRANGE", inbox, "(" .. last_read, "+")
+    redis.call("SET", unread, count, "EX", ttl)
+    return count
+end
+"""
+
+# 알림 추가와 읽지 않은 알림 수 증가를 원자적으로 처리
+# 카운터가 없으면(만료/기존 알림함) 다음 조회 때 다시 계산하도록 증가시키지 않음
+SEND_SCRIPT = """
+local stream_id = redis.call("XADD", KEYS[1], "MAXLEN", "~", ARGV[1], "*", "message", ARGV[3], "created_at", ARGV[4])
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+if redis.call("EXISTS", KEYS[2]) == 1 then
+    redis.call("INCR", KEYS[2])
+    redis.call("EXPIRE", KEYS[2], ARGV[2])
+end
+return stream_id
+"""
+
+# MAXLEN 으로 잘려 나간 알림은 셀 필요가 없으므로 알림함 길이(XLEN)로 상한을 둠
+COUNT_UNREAD_SCRIPT = LUA_HELPERS + """
+local count = redis.call("GET", KEYS[3])
+if not count then
+    count = recount(KEYS[1], KEYS[2], KEYS[3], ARGV[1])
+end
+return math.min(tonumber(count), redis.call("XLEN", KEYS[1]))
+"""
+
+# 읽음 위치 비교와 저장을 한 번에 실행해 동시에 요청해도 위치가 뒤로 이동하지 않음
+MARK_READ_SCRIPT = LUA_HELPERS + """
+local latest = redis.call("XREVRANGE", KEYS[1], "+", "-", "COUNT", 1)
+if #latest == 0 then
+    return false
+end
+local up_to = ARGV[1]
+if up_to == "" or id_greater(up_to, latest[1][1]) then
+    up_to = latest[1][1]
+end
+local last_read = redis.call("GET", KEYS[2])
+if not last_read or id_greater(up_to, last_read) then
+    redis.call("SET", KEYS[2], up_to, "EX", ARGV[2])
+    last_read = up_to
+end
+recount(KEYS[1], KEYS[2], KEYS[3], ARGV[2])
+return last_read
+"""
+
+
+def validate_stream_id(stream_id: Optional[str]) -> Optional[str]:
+    if stream_id is None:
+        return None
+    try:
+        parse_stream_id(stream_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 알림 아이디입니다.")
+    return stream_id
+
+
+def to_notification(entry) -> dict:
+    stream_id, fields = entry
+    return {"id": stream_id, "message": fields.get("message"), "created_at": fields.get("created_at")}
 
 
 # NotificationManager 클래스
 class NotificationManager:
+    # 알림은 사용자별 Redis Stream(받은 알림함)에 저장한 뒤 접속 중인 워커로 전달
+    # 스트림은 MAXLEN 으로 길이를, EXPIRE 로 보관 기간을 제한해 사용자당 메모리가 일정 이하로 유지됨
+    def __init__(self, redis_client: Redis = None):
+        self.redis_client = redis_client or shared_redis_client
+        self.send_script = self.redis_client.register_script(SEND_SCRIPT)
+        self.count_unread_script = self.redis_client.register_script(COUNT_UNREAD_SCRIPT)
+        self.mark_read_script = self.redis_client.register_script(MARK_READ_SCRIPT)
+
     @staticmethod
-    def send_notification(user_id: str, message: str):
-        notification = {"user_id": user_id, "message": message}
+    def _keys(user_id: str) -> List[str]:
+        return [inbox_key(user_id), inbox_read_key(user_id), inbox_unread_key(user_id)]
+
+    async def send_notification(self, user_id: str, message: str):
+        notification = {"user_id": user_id, "message": message, "created_at": datetime.utcnow().isoformat()}
 
         # 메시지 발행 전 로그 출력
         logging.info(f"사용자 {user_id}에게 : {message}라고 전송하였습니다.")
 
-        redis_client.publish("notifications", json.dumps(notification))
+        try:
+            notification["id"] = await self.send_script(
+                keys=[inbox_key(user_id), inbox_unread_key(user_id)],
+                args=[
+                    settings.notification_inbox_maxlen,
+                    settings.notification_inbox_ttl_seconds,
+                    message,
+                    notification["created_at"],
+                ],
+            )
+
+            # 사용자가 연결된 워커의 채널로만 발행 (접속 중이 아니면 알림함에만 남음)
+            nodes = await get_user_nodes(self.redis_client, user_id)
+            if not nodes:
+                return 0
+            payload = json.dumps(notification)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for node_id in nodes:
+                    pipe.publish(node_channel(node_id), payload)
+                await pipe.execute()
+        except RedisError as e:
+            # 알림 전송 실패가 구독 등 원래 요청을 실패시키지 않도록 로그만 남김
+            logging.error(f"Failed to send notification to {user_id}: {str(e)}")
+            return 0
+        return len(nodes)
+
+    async def get_notifications(self, user_id: str, after: Optional[str] = None, limit: int = 20) -> List[dict]:
+        # after 이후의 알림을 오래된 순으로 조회. after 가 없으면 마지막으로 읽은 알림 이후부터
+        if after is None:
+            after = await self.redis_client.get(inbox_read_key(user_id)) or "0"
+        entries = await self.redis_client.xrange(inbox_key(user_id), min=f"({after}", max="+", count=limit)
+        return [to_notification(entry) for entry in entries]
+
+    async def count_unread(self, user_id: str) -> int:
+        # 알림을 매번 세지 않고 알림 추가/읽음 처리 때 갱신되는 카운터를 조회
+        return await self.count_unread_script(
+            keys=self._keys(user_id), args=[settings.notification_inbox_ttl_seconds]
+        )
+
+    async def mark_read(self, user_id: str, up_to: Optional[str] = None) -> Optional[str]:
+        # up_to 까지(없으면 전부) 읽음 처리. 읽음 위치는 앞으로만 이동
+        return await self.mark_read_script(
+            keys=self._keys(user_id), args=[up_to or "", settings.notification_inbox_ttl_seconds]
+        )
+
+
+notification_manager = NotificationManager()
+
+
+def get_notification_manager() -> NotificationManager:
+    return notification_manager
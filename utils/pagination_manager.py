@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    payload = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    # 빈 문자열은 커서 모드의 첫 페이지를 의미함
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(item_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor 입니다.")
+
+
+def keyset_query(query: dict, after: Optional[Tuple[datetime, str]], id_field: str, direction: int = -1) -> dict:
+    if after is None:
+        return query
+    created_at, item_id = after
+    op = "$lt" if direction < 0 else "$gt"
+    keyset = {
+        "$or": [
+            {"created_at": {op: created_at}},
+            {"created_at": created_at, id_field: {op: item_id}}
+        ]
+    }
+    if not query:
+        return keyset
+    return {"$and": [query, keyset]}
+
+
+def next_cursor(items: list, limit: int, id_field: str) -> Optional[str]:
+    if len(items) < limit or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(last["created_at"], last[id_field])
@@ -0,0 +1,22 @@
+import json
+from typing import List, Tuple
+
+from pydantic import ValidationError
+from models.recipe_models import RecipeCreate
+from utils.ingredient_normalizer import normalize_ingredients
+
+
+def validate_recipe_lines(lines: List[Tuple[int, bytes]]):
+    # 프로세스 풀에서 실행되므로 모델/정규화 모듈만 가져오는 가벼운 모듈에 둠
+    documents = []
+    errors = []
+    for line_number, raw in lines:
+        try:
+            recipe = RecipeCreate(**json.loads(raw))
+        except (ValueError, TypeError, ValidationError) as e:
+            errors.append({"line": line_number, "error": str(e)})
+            continue
+        recipe.recipe_ingredient_keys = normalize_ingredients(recipe.recipe_ingredients)
+        recipe.recipe_like_count = len(recipe.recipe_like or [])
+        documents.append((line_number, recipe.dict()))
+    return documents, errors
@@ -0,0 +1,26 @@
+from redis.asyncio import BlockingConnectionPool, Redis
+from utils.config import get_settings
+
+settings = get_settings()
+
+# 프로세스 전체에서 하나의 비동기 커넥션 풀을 공유
+# 풀이 가득 차면 예외 대신 pool_timeout 동안 빈 커넥션을 기다림
+connection_pool = BlockingConnectionPool.from_url(
+    settings.redis_url,
+    decode_responses=True,
+    max_connections=settings.redis_max_connections,
+    timeout=settings.redis_pool_timeout_seconds,
+    socket_timeout=settings.redis_socket_timeout_seconds,
+    socket_connect_timeout=settings.redis_socket_timeout_seconds,
+    health_check_interval=settings.redis_health_check_interval_seconds,
+)
+redis_client = Redis(connection_pool=connection_pool)
+
+
+def get_redis() -> Redis:
+    return redis_client
+
+
+async def close_redis():
+    await redis_client.close()
+    await connection_pool.disconnect()
@@ -1,3 +1,6 @@
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
 from models.response_models import ErrorResponse
 
 common_responses = {
@@ -7,3 +10,15 @@ common_responses = {
     403: {"model": ErrorResponse, "description": "Forbidden"},
     429: {"model": ErrorResponse, "description": "Too Many Requests"},
 }
+
+
+class MongoJSONResponse(JSONResponse):
+    # Motor 문서(ObjectId, datetime 포함)를 한 번의 직렬화로 바로 bytes 로 변환
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            default=str,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
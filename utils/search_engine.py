@@ -0,0 +1,212 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING
+
+logger = logging.getLogger(__name__)
+
+# 필드별 가중치 (제목/재료가 설명보다 더 중요)
+FIELD_WEIGHTS = {
+    "recipe_title": 3.0,
+    "recipe_category": 1.0,
+    "recipe_description": 1.0,
+    "recipe_info": 1.0,
+    "recipe_ingredients": 2.0,
+}
+SEARCH_PROJECTION = {
+    "_id": 0,
+    "recipe_id": 1,
+    "recipe_title": 1,
+    "recipe_category": 1,
+    "recipe_description": 1,
+    "recipe_info": 1,
+    "recipe_ingredients.name": 1,
+}
+
+# 서버 간 시계 차이로 변경 시각이 조금 이르게 기록되어도 놓치지 않도록 겹쳐서 조회 (다시 색인해도 결과는 같음)
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+WORD_PATTERN = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str, unigrams: bool = False) -> List[str]:
+    # 한국어는 띄어쓰기/조사가 일정하지 않아 단어 단위 대신 문자 2-gram 으로 색인
+    # 색인 시에는 한 글자 검색어(파, 무 등)도 찾을 수 있도록 1-gram 을 함께 추가
+    tokens = []
+    for word in WORD_PATTERN.findall(unicodedata.normalize("NFKC", text).lower()):
+        if len(word) == 1 or unigrams:
+            tokens.extend(word)
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _field_texts(recipe: dict):
+    yield "recipe_title", recipe.get("recipe_title") or ""
+    # 모델에서 바로 색인하면 recipe_category 가 str Enum 이라 str() 이 "Category.korean" 이 되므로 값으로 변환
+    category = recipe.get("recipe_category")
+    yield "recipe_category", getattr(category, "value", category) or ""
+    yield "recipe_description", recipe.get("recipe_description") or ""
+    info = recipe.get("recipe_info")
+    if isinstance(info, dict):
+        yield "recipe_info", " ".join(v for v in info.values() if isinstance(v, str))
+    elif isinstance(info, str):
+        yield "recipe_info", info
+    for ingredient in recipe.get("recipe_ingredients") or []:
+        yield "recipe_ingredients", ingredient.get("name") or ""
+
+
+def changed_since_query(since: datetime) -> dict:
+    return {"$or": [{"created_at": {"$gt": since}}, {"updated_at": {"$gt": since}}]}
+
+
+class RecipeSearchEngine:
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.doc_terms: Dict[str, Counter] = {}
+        self.doc_lengths: Dict[str, float] = {}
+        self.total_length = 0.0
+        self.ready = False
+        self.synced_at: Optional[datetime] = None
+        # 빌드/동기화 중에 이 워커에서 발생한 변경. 끝난 뒤 다시 적용해 DB 에서 읽은 이전 값으로 덮어쓰이지 않도록 함
+        self.changes: Optional[List[Tuple[bool, object]]] = None
+
+    def _analyze(self, recipe: dict) -> Counter:
+        terms = Counter()
+        for field, text in _field_texts(recipe):
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(str(text), unigrams=True):
+                terms[token] += weight
+        return terms
+
+    def add(self, recipe: dict):
+        if self.changes is not None:
+            self.changes.append((True, recipe))
+        self._add(recipe)
+
+    def remove(self, recipe_id: str):
+        if self.changes is not None:
+            self.changes.append((False, recipe_id))
+        self._remove(recipe_id)
+
+    def _replay(self):
+        for added, change in self.changes:
+            if added:
+                self._add(change)
+            else:
+                self._remove(change)
+
+    def _add(self, recipe: dict):
+        recipe_id = recipe["recipe_id"]
+        self._remove(recipe_id)
+        terms = self._analyze(recipe)
+        for term, tf in terms.items():
+            self.postings[term][recipe_id] = tf
+        length = sum(terms.values())
+        self.doc_terms[recipe_id] = terms
+        self.doc_lengths[recipe_id] = length
+        self.total_length += length
+
+    def _remove(self, recipe_id: str):
+        terms = self.doc_terms.pop(recipe_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(recipe_id, None)
+            if not posting:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(recipe_id, 0.0)
+
+    def search(self, query: str, skip: int = 0, limit: int = 160) -> List[str]:
+        scores = self.score(query)
+        top = heapq.nsmallest(skip + limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [recipe_id for recipe_id, _ in top[skip:]]
+
+    def score(self, query: str) -> Dict[str, float]:
+        doc_count = len(self.doc_lengths)
+        if doc_count == 0:
+            return {}
+        avg_length = self.total_length / doc_count or 1.0
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for recipe_id, tf in posting.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[recipe_id] / avg_length)
+                scores[recipe_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    async def _load(self, cursor, batch_size: int) -> int:
+        count = 0
+        async for recipe in cursor.batch_size(batch_size):
+            self._add(recipe)
+            count += 1
+            if count % batch_size == 0:
+                await asyncio.sleep(0)
+        return count
+
+    async def build(self, collection, batch_size: int = 1000):
+        # 새 인덱스를 만든 뒤 한 번에 교체하여 빌드 중에도 기존 인덱스로 검색 가능
+        started_at = datetime.utcnow()
+        fresh = RecipeSearchEngine()
+        self.changes = []
+        try:
+            count = await fresh._load(collection.find({}, SEARCH_PROJECTION), batch_size)
+            self.postings = fresh.postings
+            self.doc_terms = fresh.doc_terms
+            self.doc_lengths = fresh.doc_lengths
+            self.total_length = fresh.total_length
+            self._replay()
+        finally:
+            self.changes = None
+        self.synced_at = started_at
+        self.ready = True
+        logger.info(f"검색 인덱스 빌드 완료: {count}개 레시피")
+
+    async def refresh(self, collection, batch_size: int = 1000):
+        # 마지막 동기화 이후 생성/수정된 레시피만 다시 색인하고,
+        # 삭제된 레시피는 recipe_id 인덱스만 읽는 아이디 목록과 비교해 제거
+        started_at = datetime.utcnow()
+        since = self.synced_at - REFRESH_OVERLAP
+        self.changes = []
+        try:
+            count = await self._load(collection.find(changed_since_query(since), SEARCH_PROJECTION), batch_size)
+            cursor = collection.find({}, {"_id": 0, "recipe_id": 1}).hint([("recipe_id", ASCENDING)])
+            recipe_ids = {recipe["recipe_id"] async for recipe in cursor.batch_size(batch_size * 10)}
+            removed = [recipe_id for recipe_id in self.doc_terms if recipe_id not in recipe_ids]
+            for recipe_id in removed:
+                self._remove(recipe_id)
+            self._replay()
+        finally:
+            self.changes = None
+        self.synced_at = started_at
+        if count or removed:
+            logger.info(f"검색 인덱스 갱신: {count}개 색인, {len(removed)}개 제거")
+
+    async def run(self, collection, interval: float):
+        # 기동 시 백그라운드로 전체 빌드하고, 이후에는 다른 워커에서 발생한 변경 사항만 주기적으로 반영
+        while True:
+            try:
+                if self.ready:
+                    await self.refresh(collection)
+                else:
+                    await self.build(collection)
+            except Exception as e:
+                logger.error(f"Failed to build search index: {str(e)}")
+            await asyncio.sleep(interval)
+
+
+search_engine = RecipeSearchEngine()
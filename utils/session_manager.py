@@ -1,19 +1,27 @@
-from fastapi import Depends, HTTPException, status, Header, Request
+from fastapi import Depends, HTTPException, status, Header
+from starlette.requests import HTTPConnection
 from pydantic import BaseModel
 from models.user_models import UserInDB, UserIn
 from typing import Optional
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from .cache_manager import LocalTTLCache
 from .config import get_settings
 from .hash_manager import Hasher
+from .redis_manager import redis_client as shared_redis_client
+import asyncio
+import logging
 import uuid
 import random
 import string
-import redis
 from datetime import datetime
 
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+# 로그아웃/탈퇴로 삭제된 세션을 모든 워커의 로컬 캐시에서 지우기 위한 채널
+SESSION_INVALIDATION_CHANNEL = "sessions:invalidate"
 
 
 class Session(BaseModel):
@@ -21,39 +29,73 @@ class Session(BaseModel):
 
 
 class SessionManager:
-    def __init__(self):
-        self.redis_client = redis.Redis.from_url(
-            settings.redis_url, decode_responses=True
-        )
+    # 모든 요청이 공유 비동기 커넥션 풀을 사용 (요청마다 풀을 만들거나 이벤트 루프를 막지 않음)
+    def __init__(self, redis_client: Redis = None, local_cache: LocalTTLCache = None):
+        self.redis_client = redis_client or shared_redis_client
+        # 세션 → 사용자 아이디를 몇 초간 보관해 인증이 필요한 요청마다 Redis 를 조회하지 않도록 함
+        self.local_cache = local_cache
 
-    def create_session(self, data: str):
+    async def create_session(self, data: str):
         session_id = str(uuid.uuid4())
-        self.redis_client.set(session_id, data)
+        await self.redis_client.set(session_id, data)
         return session_id
 
-    def get_session(self, session_id: str, expiration: int = 3600):
+    async def get_session(self, session_id: str, expiration: int = 3600):
         if session_id is None:
             raise ValueError("Session ID cannot be None")
-        data = self.redis_client.get(session_id)
+        if self.local_cache is not None:
+            data = self.local_cache.get(session_id)
+            if data is not None:
+                return data
+        # 조회와 만료 시간 갱신을 GETEX 한 번으로 처리
+        data = await self.redis_client.getex(session_id, ex=expiration)
         if data is None:
             raise HTTPException(status_code=401, detail="Invalid session id")
-        self.redis_client.expire(session_id, expiration)
+        if self.local_cache is not None:
+            self.local_cache.set(session_id, data)
         return data
 
     async def delete_session(self, session_id: str):
-        result = self.redis_client.delete(session_id)
+        if self.local_cache is not None:
+            self.local_cache.delete(session_id)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            result, _ = await pipe.delete(session_id).publish(SESSION_INVALIDATION_CHANNEL, session_id).execute()
         return result > 0
 
-    def create_verification_code(self, email: str):
+    async def listen_invalidations(self):
+        # 다른 워커에서 삭제된 세션을 로컬 캐시에서 제거. lifespan 에서 백그라운드로 실행
+        if self.local_cache is None:
+            return
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(SESSION_INVALIDATION_CHANNEL)
+            while True:
+                try:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                except RedisError as e:
+                    # 연결이 끊긴 동안 놓친 무효화는 로컬 캐시 TTL 이 지나면 반영됨
+                    logger.error(f"Failed to read session invalidations: {str(e)}")
+                    await asyncio.sleep(1)
+                    continue
+                if message is not None:
+                    self.local_cache.delete(message["data"])
+        finally:
+            await pubsub.close()
+
+    def stats(self) -> dict:
+        return self.local_cache.stats() if self.local_cache is not None else None
+
+    async def create_verification_code(self, email: str):
         verification_code = str(uuid.uuid4())
-        self.redis_client.set(verification_code, email, ex=86400)
+        await self.redis_client.set(verification_code, email, ex=86400)
         return verification_code
 
-    def verify_email(self, code: str):
-        email = self.redis_client.get(code)
+    async def verify_email(self, code: str):
+        # 조회와 삭제를 하나의 트랜잭션으로 보내 같은 코드가 두 번 사용되지 않도록 함
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            email, _ = await pipe.get(code).delete(code).execute()
         if email is None:
             return False
-        self.redis_client.delete(code)
         return email
 
     async def save_user_info(self, user: UserIn):
@@ -64,37 +106,49 @@ class SessionManager:
             created_at=datetime.now(),
         )
         user_json = user_in_redis.json()
-        self.redis_client.set(user_in_redis.email, user_json, ex=86400)
+        await self.redis_client.set(user_in_redis.email, user_json, ex=86400)
 
-    def get_user_info(self, email: str):
-        user_json = self.redis_client.get(email)
+    async def get_user_info(self, email: str):
+        user_json = await self.redis_client.get(email)
         if user_json is None:
             return None
         user_in_redis = UserInDB.parse_raw(user_json)
         return UserInDB(**user_in_redis.dict(), password=user_in_redis.hashed_password)
 
-    def create_email_verification_code(self, email: str):
+    async def create_email_verification_code(self, email: str):
         verification_code = "".join(
             random.choices(string.ascii_uppercase + string.digits, k=6)
         )
-        self.redis_client.set(verification_code, email, ex=1800)
+        await self.redis_client.set(verification_code, email, ex=1800)
         return verification_code
 
-    def check_verification_code(self, email: str, code: str):
-        verified_email = self.verify_email(code)
+    async def check_verification_code(self, email: str, code: str):
+        verified_email = await self.verify_email(code)
         return verified_email == email
 
 
+session_manager = SessionManager(
+    local_cache=LocalTTLCache(settings.session_cache_size, settings.session_cache_ttl_seconds)
+    if settings.session_cache_size > 0 else None
+)
+
+
+def get_session_manager() -> SessionManager:
+    return session_manager
+
+
 def get_verification_link(email: str, verification_code: str) -> str:
     base_url = "https://www.matissue.com/auth/verify"
     verification_link = f"{base_url}?code={verification_code}"
     return verification_link
 
 
-def get_current_session(request: Request) -> str:
+async def get_current_session(
+    request: HTTPConnection, session_manager: SessionManager = Depends(get_session_manager)
+) -> str:
+    # HTTP 요청과 웹소켓 모두 같은 session-id 쿠키로 인증
     session_id = request.cookies.get("session-id")
-    session_manager = SessionManager()
-    current_user = session_manager.get_session(session_id)
+    current_user = await session_manager.get_session(session_id)
 
     # 관리자인 경우, 예외처리를 합니다.
     if current_user and getattr(current_user, "id", None) == "admin":
@@ -112,13 +166,13 @@ def get_current_session(request: Request) -> str:
 
 async def get_current_user(
     session: Session = Depends(),
-    session_manager: SessionManager = Depends(SessionManager),
+    session_manager: SessionManager = Depends(get_session_manager),
 ):
     if session.id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Sesssion ID가 없습니다."
         )
-    user_id = session_manager.get_session(session.id)
+    user_id = await session_manager.get_session(session.id)
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -128,9 +182,9 @@ async def get_current_user(
 
 
 async def verify_email(
-    code: str, session_manager: SessionManager = Depends(SessionManager)
+    code: str, session_manager: SessionManager = Depends(get_session_manager)
 ):
-    verification_result = session_manager.verify_email(code)
+    verification_result = await session_manager.verify_email(code)
     if not verification_result:
         raise HTTPException(status_code=400, detail="Invalid verification code")
     return {"message": "Email verification successful"}
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict
+from pymongo.errors import BulkWriteError
+from utils.cache_manager import recipe_cache, recipe_key
+from utils.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class ViewCountManager:
+    # 조회수 증가를 메모리에 모아두었다가 주기적으로 bulk_write 한 번으로 반영
+    # 프로세스가 비정상 종료되면 최대 flush_interval 동안의 조회수가 유실될 수 있음
+    # 반영한 레시피의 상세 캐시는 무효화하므로 캐시된 조회수는 최대 flush_interval 만큼만 뒤처짐
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.pending: Dict[str, int] = defaultdict(int)
+        self._flush_requested = asyncio.Event()
+
+    def increment(self, recipe_id: str, amount: int = 1):
+        self.pending[recipe_id] += amount
+        if len(self.pending) >= self.max_pending:
+            self._flush_requested.set()
+
+    def get_pending(self, recipe_id: str) -> int:
+        return self.pending.get(recipe_id, 0)
+
+    async def flush(self, recipe_dao):
+        if not self.pending:
+            return 0
+        counts, self.pending = self.pending, defaultdict(int)
+        failed = set()
+        try:
+            modified = await recipe_dao.increment_recipe_views(counts)
+        except asyncio.CancelledError:
+            self._restore(counts)
+            raise
+        except BulkWriteError as e:
+            # 순서 없는 bulk_write 는 나머지 연산을 반영하므로 실패한 연산(writeErrors 의 index)만 다시 시도
+            # writeConcernErrors 는 쓰기 자체는 반영된 것이라 되돌리지 않음
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            self._restore({
+                recipe_id: amount
+                for index, (recipe_id, amount) in enumerate(counts.items())
+                if index in failed
+            })
+            logger.error(f"Failed to flush {len(failed)} recipe views: {str(e)}")
+            modified = e.details.get("nModified", 0)
+        except Exception as e:
+            # 쓰기 전에 실패한 증가분은 다음 flush 때 다시 시도
+            self._restore(counts)
+            logger.error(f"Failed to flush recipe views: {str(e)}")
+            return 0
+        # 상세 캐시에 남은 이전 조회수를 지움. 쓰기 이후의 실패는 증가분을 되돌리지 않음
+        written = [recipe_id for index, recipe_id in enumerate(counts) if index not in failed]
+        if written:
+            try:
+                await recipe_cache.invalidate(*[recipe_key(recipe_id) for recipe_id in written])
+            except Exception as e:
+                logger.error(f"Failed to invalidate recipe views: {str(e)}")
+        return modified
+
+    def _restore(self, counts: Dict[str, int]):
+        for recipe_id, amount in counts.items():
+            self.pending[recipe_id] += amount
+
+    async def run(self, recipe_dao):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush(recipe_dao)
+
+
+view_count_manager = ViewCountManager(
+    settings.view_flush_interval_seconds,
+    settings.view_flush_max_pending
+)
@@ -1,23 +1,77 @@
-from typing import List
-from fastapi import WebSocket
+import asyncio
+import json
+import logging
+from typing import List, Optional, Set
+from fastapi import WebSocket, status
 from pydantic import BaseModel
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class WebSocketManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    # 메시지는 한 번만 직렬화해 모든 연결에 동시에 전송하고, 전송 중에 들어온 메시지는 다음 배치 프레임으로 묶음
+    def __init__(self, send_timeout: float = 5.0):
+        self.active_connections: Set[WebSocket] = set()
+        self.send_timeout = send_timeout
+        self.pending: List[str] = []
+        self.flush_task: Optional[asyncio.Task] = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
     async def send_message(self, message: BaseModel):
-        for connection in self.active_connections:
-            await connection.send_json(message.dict())
+        self.pending.append(json.dumps(message.dict(), default=str))
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self._flush())
+        # 이 메시지가 포함된 프레임까지 전송되면 반환 (호출 측이 취소되어도 전송은 계속)
+        await asyncio.shield(self.flush_task)
+
+    async def _flush(self):
+        try:
+            while self.pending:
+                payloads, self.pending = self.pending, []
+                await self.broadcast(self._frame(payloads))
+        finally:
+            self.flush_task = None
+
+    @staticmethod
+    def _frame(payloads: List[str]) -> str:
+        # 한 건이면 기존과 같은 형식, 여러 건이면 이미 직렬화된 문자열을 이어 붙여 배치 프레임 생성
+        if len(payloads) == 1:
+            return payloads[0]
+        return '{"type":"batch","messages":[' + ",".join(payloads) + "]}"
+
+    async def broadcast(self, frame: str):
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(self._send(connection, frame) for connection in connections)
+        )
+        return sum(results)
+
+    async def _send(self, connection: WebSocket, frame: str) -> bool:
+        try:
+            await asyncio.wait_for(connection.send_text(frame), timeout=self.send_timeout)
+            return True
+        except Exception as e:
+            # 응답하지 않거나 끊어진 연결은 다른 연결 전송을 막지 않도록 제거
+            logger.warning(f"Dropping websocket after failed send: {e!r}")
+            self.disconnect(connection)
+            await self._close(connection)
+            return False
+
+    async def _close(self, connection: WebSocket):
+        # 목록에서만 빼면 클라이언트는 연결된 줄 알고 기다리므로 소켓도 닫음 (응답 없는 소켓에 막히지 않도록 제한 시간 적용)
+        try:
+            await asyncio.wait_for(
+                connection.close(code=status.WS_1011_INTERNAL_ERROR), timeout=self.send_timeout
+            )
+        except Exception:
+            pass
 
 
 class UserNotification(BaseModel):